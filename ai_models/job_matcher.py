@@ -1,17 +1,132 @@
 # utils/ai_models/job_matcher.py
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
+import re
 import numpy as np
-from rank_bm25 import BM25Okapi
+from utils.data_normalizer import JobNormalizer
+
+SENIORITY_LEVELS = {'Entry Level': 0, 'Mid Level': 1, 'Senior': 2, 'Management': 3}
+WORK_MODES = {'On-site': 0, 'Hybrid': 1, 'Remote': 2}
+
+# Experience score by distance between CV and job seniority level
+EXPERIENCE_SCORES = np.array([1.0, 0.6, 0.2, 0.0], dtype=np.float32)
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(words):
+        """Set bits per row of a uint64 bitset matrix"""
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int32)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        """Set bits per row of a uint64 bitset matrix"""
+        return _BYTE_POPCOUNT[words.view(np.uint8)].sum(axis=1, dtype=np.int32)
+
+
+def _set_bits(row, positions):
+    for pos in positions:
+        row[pos >> 6] |= np.uint64(1) << np.uint64(pos & 63)
+
+
+def _bitsets(n, width, rows, bits):
+    """Build an (n, words) uint64 bitset matrix with the given (row, bit) cells set"""
+    matrix = np.zeros((n, (width + 63) // 64), dtype=np.uint64)
+    bits = np.asarray(bits, dtype=np.uint64)
+    np.bitwise_or.at(matrix, (np.asarray(rows, dtype=np.intp), (bits >> np.uint64(6)).astype(np.intp)),
+                     np.uint64(1) << (bits & np.uint64(63)))
+    return matrix
+
+
+def _title_tokens(title):
+    return set(re.findall(r'[a-z0-9+#.]+', title.lower()))
+
+
+def _salary_range(job):
+    """Annual (min, max) for a job, or None; accepts numeric pairs or salary text"""
+    salary_range = job.get('salary_range')
+    if isinstance(salary_range, (list, tuple)) and len(salary_range) == 2:
+        try:
+            return float(salary_range[0]), float(salary_range[1])
+        except (TypeError, ValueError):
+            pass
+    if job.get('salary_max') is not None:
+        # Normalized jobs carry the range parsed by JobNormalizer.parse_salary
+        return job['salary_min'], job['salary_max']
+    for text in (salary_range, job.get('salary')):
+        if isinstance(text, str) and text:
+            low, high = JobNormalizer.parse_salary(text)
+            if high is not None:
+                return low, high
+    return None
+
+
+def _location_key(location):
+    return location.split(',')[0].strip().lower()
+
+
+class JobIndex:
+    """Columnar view of a job list used for vectorized scoring.
+
+    Built once per job list (O(n) Python work); every subsequent score call
+    is pure array arithmetic over these columns.
+    """
+
+    def __init__(self, jobs, company_scores=None):
+        n = len(jobs)
+        self.jobs = jobs
+        self.skill_vocab = {}
+        self.title_vocab = {}
+        self.location_vocab = {}
+        company_scores = company_scores or {}
+
+        skill_cells = ([], [])  # (row, bit) pairs, scattered into bitsets in one call
+        title_cells = ([], [])
+        self.experience = np.empty(n, dtype=np.int8)
+        self.location = np.empty(n, dtype=np.int32)
+        self.work_mode = np.empty(n, dtype=np.int8)
+        self.salary = np.full((n, 2), np.nan, dtype=np.float32)
+        self.company = np.empty(n, dtype=np.float32)
+
+        for i, job in enumerate(jobs):
+            title = job.get('title', '')
+            for skill in job.get('required_skills') or job.get('skills') or []:
+                skill_cells[0].append(i)
+                skill_cells[1].append(self.skill_vocab.setdefault(skill.lower(), len(self.skill_vocab)))
+            for token in _title_tokens(title):
+                title_cells[0].append(i)
+                title_cells[1].append(self.title_vocab.setdefault(token, len(self.title_vocab)))
+            level = job.get('experience_level') or JobNormalizer.detect_seniority(title)
+            self.experience[i] = SENIORITY_LEVELS.get(level, -1)
+            self.location[i] = self.location_vocab.setdefault(
+                _location_key(job.get('location', '')), len(self.location_vocab))
+            self.work_mode[i] = WORK_MODES.get(job.get('work_mode'), 0)
+            salary = _salary_range(job)
+            if salary is not None:
+                self.salary[i] = salary
+            self.company[i] = company_scores.get(job.get('company', ''), 0.5)
+
+        self.skill_bits = _bitsets(n, max(1, len(self.skill_vocab)), *skill_cells)
+        self.title_bits = _bitsets(n, max(1, len(self.title_vocab)), *title_cells)
+        self.skill_counts = _popcount(self.skill_bits)
+
+    def __len__(self):
+        return len(self.jobs)
+
 
 class JobMatchingEngine:
-    def __init__(self):
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.skill_weights = self._load_skill_weights()
-        
-    def match_jobs_to_cv(self, cv_data, jobs, weights=None):
+    def __init__(self, company_scores=None):
+        # Company name -> reputation score in [0, 1]; unknown companies score 0.5
+        self.company_scores = company_scores or {}
+
+    def build_index(self, jobs):
+        """Build a reusable columnar index over jobs"""
+        return JobIndex(jobs, self.company_scores)
+
+    def match_jobs_to_cv(self, cv_data, jobs, weights=None, top_k=50):
         """
         Multi-factor job matching with configurable weights
+
+        `jobs` may be a list of job dicts or a JobIndex from build_index();
+        reuse the index to score many CVs against the same corpus. Returns
+        the top_k jobs (all when top_k is None), best first.
         """
         if weights is None:
             weights = {
@@ -22,59 +137,82 @@ class JobMatchingEngine:
                 'salary': 0.10,
                 'company_prestige': 0.10
             }
-        
+
+        if top_k is not None and top_k < 0:
+            raise ValueError('top_k must be non-negative or None')
+
+        index = jobs if isinstance(jobs, JobIndex) else self.build_index(jobs)
+        if not len(index):
+            return []
+
+        components = self.score_components(cv_data, index)
+        total = sum(components[name] * weights[name] for name in components)
+
+        # Partial selection of the top k, then an ordered sort of just those
+        k = len(index) if top_k is None else min(top_k, len(index))
+        top = np.argpartition(-total, k - 1)[:k] if k < len(index) else np.arange(len(index))
+        top = top[np.argsort(-total[top], kind='stable')]
+
         matches = []
-        cv_embedding = self.embedding_model.encode(cv_data['text'])
-        
-        for job in jobs:
-            score_components = {}
-            
-            # 1. Skill matching (BM25 + semantic)
-            skill_score = self._calculate_skill_match(
-                cv_data['skills'], 
-                job['required_skills']
-            )
-            
-            # 2. Title relevance
-            title_score = self._calculate_title_relevance(
-                cv_data['target_title'],
-                job['title']
-            )
-            
-            # 3. Experience level match
-            exp_score = self._match_experience_level(
-                cv_data['experience_years'],
-                job['experience_level']
-            )
-            
-            # 4. Location preference
-            location_score = self._calculate_location_score(
-                cv_data['preferred_locations'],
-                job['location'],
-                job['work_mode']
-            )
-            
-            # 5. Salary alignment
-            salary_score = self._calculate_salary_alignment(
-                cv_data['expected_salary'],
-                job['salary_range']
-            )
-            
-            # 6. Company reputation (if available)
-            company_score = self._get_company_score(job['company'])
-            
-            # Calculate weighted score
-            total_score = (
-                skill_score * weights['skills'] +
-                title_score * weights['title'] +
-                exp_score * weights['experience'] +
-                location_score * weights['location'] +
-                salary_score * weights['salary'] +
-                company_score * weights['company_prestige']
-            )
-            
-            job['match_score'] = round(total_score * 100, 2)
-            job['score_breakdown'] = score_components
+        for i in top:
+            job = dict(index.jobs[i])
+            job['match_score'] = round(float(total[i]) * 100, 2)
+            job['score_breakdown'] = {name: round(float(scores[i]), 3) for name, scores in components.items()}
             matches.append(job)
-        
-        return sorted(matches, key=lambda x: x['match_score'], reverse=True)
\ No newline at end of file
+        return matches
+
+    def score_components(self, cv_data, index):
+        """Score every job on all six factors, each in [0, 1]"""
+        return {
+            'skills': self._calculate_skill_match(cv_data.get('skills', []), index),
+            'title': self._calculate_title_relevance(cv_data.get('target_title', ''), index),
+            'experience': self._match_experience_level(cv_data.get('experience_years'), index),
+            'location': self._calculate_location_score(cv_data.get('preferred_locations', []), index),
+            'salary': self._calculate_salary_alignment(cv_data.get('expected_salary'), index),
+            'company_prestige': index.company
+        }
+
+    def _calculate_skill_match(self, cv_skills, index):
+        """Share of each job's required skills covered by the CV"""
+        cv_bits = np.zeros(index.skill_bits.shape[1], dtype=np.uint64)
+        _set_bits(cv_bits, [index.skill_vocab[s.lower()] for s in cv_skills if s.lower() in index.skill_vocab])
+        overlap = _popcount(index.skill_bits & cv_bits)
+        return np.divide(overlap, index.skill_counts, out=np.zeros(len(index), dtype=np.float32),
+                         where=index.skill_counts > 0)
+
+    def _calculate_title_relevance(self, target_title, index):
+        """Share of the target title's tokens present in each job title"""
+        tokens = _title_tokens(target_title or '')
+        if not tokens:
+            return np.zeros(len(index), dtype=np.float32)
+        cv_bits = np.zeros(index.title_bits.shape[1], dtype=np.uint64)
+        # Tokens missing from the vocab appear in no title but still count against the share
+        _set_bits(cv_bits, [index.title_vocab[token] for token in tokens if token in index.title_vocab])
+        return _popcount(index.title_bits & cv_bits).astype(np.float32) / len(tokens)
+
+    def _match_experience_level(self, experience_years, index):
+        """Closeness of CV seniority to each job's level; unknown levels score 0.5"""
+        if experience_years is None:
+            return np.full(len(index), 0.5, dtype=np.float32)
+        cv_level = np.searchsorted([2, 5, 10], experience_years, side='right')
+        distance = np.minimum(np.abs(index.experience.astype(np.int16) - cv_level), 3)
+        scores = EXPERIENCE_SCORES[distance]
+        return np.where(index.experience < 0, np.float32(0.5), scores)
+
+    def _calculate_location_score(self, preferred_locations, index):
+        """1 for remote or preferred locations, 0.5 for hybrid, otherwise 0"""
+        if not preferred_locations:
+            return np.ones(len(index), dtype=np.float32)
+        codes = [index.location_vocab[key] for key in map(_location_key, preferred_locations)
+                 if key in index.location_vocab]
+        scores = np.where(index.work_mode == WORK_MODES['Hybrid'], np.float32(0.5), np.float32(0.0))
+        scores[np.isin(index.location, codes) | (index.work_mode == WORK_MODES['Remote'])] = 1.0
+        return scores
+
+    def _calculate_salary_alignment(self, expected_salary, index):
+        """How far each job's salary range reaches the expectation; unknown salaries score 0.5"""
+        if not expected_salary:
+            return np.full(len(index), 0.5, dtype=np.float32)
+        upper = index.salary[:, 1]
+        scores = np.clip(upper / np.float32(expected_salary), 0.0, 1.0)
+        return np.where(np.isnan(upper), np.float32(0.5), scores)
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, jsonify, send_from_directory, Response
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -8,21 +8,61 @@ import uuid
 from datetime import datetime
 import logging
 import redis
+from redis.retry import Retry
+from redis.backoff import NoBackoff
 from werkzeug.utils import secure_filename
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
 import re
+import time
+import hmac
+import functools
+import itertools
+from utils.metrics import (
+    SCRAPE_FETCH_SECONDS, SCRAPE_PARSE_SECONDS, PARSE_WAIT_SECONDS, SCRAPE_JOBS, SCRAPE_ERRORS,
+    DEDUP_RATIO, MATCH_SECONDS, CACHE_REQUESTS, CV_STAGE_SECONDS, PROBE_SECONDS,
+    render_metrics
+)
+from utils.profiling import RequestProfiler
+from utils.page_archive import PageArchive
+from utils.scrapers.parse_pool import ParsePool, apply_search_defaults
+from utils.enrichment import JobEnricher
+from utils.job_corpus import JobCorpus
+from utils.facets import FacetIndex, iter_ids, clean_filters, clean_amount
+from utils.analytics import MarketAnalytics
+from utils.alerts import SavedSearchIndex, AlertDispatcher, AlertEngine
+from utils.assets import AssetManifest
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+app = Flask(__name__, static_folder=None)  # Static files go through serve_static
 CORS(app)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB
+app.config['JOBS_CACHE_TTL'] = 300  # Results older than this are stale
+app.config['JOBS_CACHE_STALE_TTL'] = 3600  # Stale results kept as a fallback
+app.config['HEALTH_PROBE_TIMEOUT'] = 5
+app.config['HEALTH_SOURCE_TTL'] = 60  # Reuse job source probe results this long
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN', '')
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', 'logs/profiles')
+app.config['PROFILE_MAX_FILES'] = int(os.environ.get('PROFILE_MAX_FILES', 50))
+app.config['PROFILE_SLOW_THRESHOLD'] = float(os.environ.get('PROFILE_SLOW_THRESHOLD', 2.0))  # 0 disables
+app.config['PAGE_ARCHIVE_DIR'] = os.environ.get('PAGE_ARCHIVE_DIR', '')  # Empty disables archiving
+app.config['PARSE_WORKERS'] = int(os.environ.get('PARSE_WORKERS', 2))  # Parser processes per web worker
+app.config['PARSE_MAX_PENDING'] = int(os.environ.get('PARSE_MAX_PENDING', 0)) or None  # Default: 2 per process
+app.config['ENRICH_TOP_N'] = 10  # Jobs per search that get detail pages
+app.config['ENRICH_BUDGET_PER_SOURCE'] = 5  # Detail fetches per source per search
+app.config['ENRICH_RATE_LIMIT'] = 30  # Detail fetches per source per window, across all workers
+app.config['ENRICH_RATE_WINDOW'] = 60
+app.config['ENRICH_WAIT'] = float(os.environ.get('ENRICH_WAIT', 1.0))  # Max seconds a search waits for details
+app.config['ENRICH_CACHE_TTL'] = 7 * 24 * 3600
+app.config['ENRICH_FAILURE_TTL'] = 600  # Failed detail fetches are not retried for this long
+app.config['CORPUS_PATH'] = os.environ.get('CORPUS_PATH', 'data/jobs.jsonl')
+app.config['SAVED_SEARCH_PATH'] = os.environ.get('SAVED_SEARCH_PATH', 'data/saved_searches.jsonl')
+app.config['ALERT_FLUSH_INTERVAL'] = 60  # Seconds between batched alert deliveries
 
 # Rate limiting
 limiter = Limiter(
@@ -33,12 +73,63 @@ limiter = Limiter(
 
 # Initialize Redis
 cache = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+# Separate client so health checks are bounded by the probe timeout (no retries)
+health_cache = redis.Redis(
+    host='localhost', port=6379, db=0,
+    socket_timeout=app.config['HEALTH_PROBE_TIMEOUT'],
+    socket_connect_timeout=app.config['HEALTH_PROBE_TIMEOUT'],
+    retry=Retry(NoBackoff(), 0)
+)
 
 class JobScraper:
-    def __init__(self):
+    def __init__(self, parse_pool, archive=None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.parse_pool = parse_pool
+        self.archive = archive
+    
+    async def fetch_page(self, source, url, archive=True):
+        """Fetch a page, returning its HTML or None on failure; result pages are archived"""
+        try:
+            async with aiohttp.ClientSession() as session:
+                start = time.perf_counter()
+                with SCRAPE_FETCH_SECONDS.labels(source).time():
+                    async with session.get(url, headers=self.headers) as response:
+                        if response.status == 200:
+                            html = await response.text()
+                        else:
+                            html = None
+                            logger.warning(f"{source} returned HTTP {response.status}")
+                if html is not None:
+                    if archive and self.archive:
+                        await self.archive_page(source, url, html, time.perf_counter() - start)
+                    return html
+        except Exception as e:
+            logger.error(f"{source} fetch error: {e}")
+        SCRAPE_ERRORS.labels(source).inc()
+        return None
+    
+    async def archive_page(self, source, url, html, elapsed):
+        """Store a fetched page for replay; compression runs off the event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None, functools.partial(self.archive.store, source, url, html,
+                                        elapsed_ms=round(elapsed * 1000, 1))
+            )
+        except OSError as e:
+            logger.error(f"Page archive error: {e}")
+    
+    async def parse_page(self, source, html, query, limit=20):
+        """Parse a result page in the process pool and apply search-level defaults"""
+        jobs, elapsed, waited = await self.parse_pool.parse(source, html, limit)
+        SCRAPE_PARSE_SECONDS.labels(source).observe(elapsed)
+        PARSE_WAIT_SECONDS.labels(source).observe(waited)
+        
+        apply_search_defaults(jobs, query)
+        SCRAPE_JOBS.labels(source).observe(len(jobs))
+        return jobs
     
     async def scrape_linkedin(self, query, location=None):
         """Scrape LinkedIn jobs"""
@@ -48,32 +139,9 @@ class JobScraper:
             if location:
                 url += f"&location={location}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        soup = BeautifulSoup(await response.text(), 'html.parser')
-                        # LinkedIn job parsing logic
-                        job_cards = soup.find_all('div', class_='base-card')
-                        
-                        for card in job_cards[:20]:  # Limit to 20 jobs
-                            try:
-                                title_elem = card.find('h3', class_='base-search-card__title')
-                                company_elem = card.find('h4', class_='base-search-card__subtitle')
-                                location_elem = card.find('span', class_='job-search-card__location')
-                                
-                                if title_elem and company_elem:
-                                    job = {
-                                        'title': title_elem.text.strip(),
-                                        'company': company_elem.text.strip(),
-                                        'location': location_elem.text.strip() if location_elem else 'Remote',
-                                        'source': 'LinkedIn',
-                                        'posted_date': datetime.now().strftime('%Y-%m-%d'),
-                                        'apply_url': card.find('a', class_='base-card__full-link')['href'] if card.find('a', class_='base-card__full-link') else '',
-                                        'work_mode': 'Remote' if 'remote' in query.lower() else 'On-site'
-                                    }
-                                    jobs.append(job)
-                            except:
-                                continue
+            html = await self.fetch_page('linkedin', url)
+            if html:
+                jobs = await self.parse_page('linkedin', html, query)
         except Exception as e:
             logger.error(f"LinkedIn scraping error: {e}")
         
@@ -87,31 +155,9 @@ class JobScraper:
             if location:
                 url += f"&l={location}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        soup = BeautifulSoup(await response.text(), 'html.parser')
-                        job_cards = soup.find_all('div', class_='job_seen_beacon')
-                        
-                        for card in job_cards[:20]:
-                            try:
-                                title_elem = card.find('h2', class_='jobTitle')
-                                company_elem = card.find('span', class_='companyName')
-                                location_elem = card.find('div', class_='companyLocation')
-                                
-                                if title_elem and company_elem:
-                                    job = {
-                                        'title': title_elem.text.strip(),
-                                        'company': company_elem.text.strip(),
-                                        'location': location_elem.text.strip() if location_elem else 'Remote',
-                                        'source': 'Indeed',
-                                        'posted_date': datetime.now().strftime('%Y-%m-%d'),
-                                        'apply_url': f"https://indeed.com{title_elem.find('a')['href']}" if title_elem.find('a') else '',
-                                        'work_mode': 'Remote' if 'remote' in query.lower() else 'On-site'
-                                    }
-                                    jobs.append(job)
-                            except:
-                                continue
+            html = await self.fetch_page('indeed', url)
+            if html:
+                jobs = await self.parse_page('indeed', html, query)
         except Exception as e:
             logger.error(f"Indeed scraping error: {e}")
         
@@ -151,6 +197,9 @@ class JobScraper:
                 seen.add(job_id)
                 unique_jobs.append(job)
         
+        if jobs:
+            DEDUP_RATIO.observe(1 - len(unique_jobs) / len(jobs))
+        
         return unique_jobs
 
 class CVAnalyzer:
@@ -177,9 +226,10 @@ class CVAnalyzer:
         # Extract skills
         cv_lower = cv_text.lower()
         found_skills = []
-        for skill in self.skill_keywords:
-            if skill in cv_lower:
-                found_skills.append(skill)
+        with CV_STAGE_SECONDS.labels('skills').time():
+            for skill in self.skill_keywords:
+                if skill in cv_lower:
+                    found_skills.append(skill)
         
         analysis['skills_found'] = found_skills
         
@@ -189,9 +239,10 @@ class CVAnalyzer:
         # Check for sections
         sections = ['experience', 'education', 'skills', 'projects', 'summary']
         section_count = 0
-        for section in sections:
-            if section in cv_lower:
-                section_count += 1
+        with CV_STAGE_SECONDS.labels('sections').time():
+            for section in sections:
+                if section in cv_lower:
+                    section_count += 1
         
         sections_score = min(30, section_count * 6)  # Max 30 points for sections
         
@@ -206,7 +257,8 @@ class CVAnalyzer:
         # Check for action verbs
         action_verbs = ['achieved', 'managed', 'led', 'developed', 'created', 
                        'implemented', 'improved', 'increased', 'reduced', 'optimized']
-        verb_count = sum(1 for verb in action_verbs if verb in cv_lower)
+        with CV_STAGE_SECONDS.labels('action_verbs').time():
+            verb_count = sum(1 for verb in action_verbs if verb in cv_lower)
         verbs_score = min(20, verb_count * 2)
         
         # Overall score
@@ -246,9 +298,50 @@ class JobMatcher:
         return min(100, match_percentage)
 
 # Initialize services
-scraper = JobScraper()
+scraper = JobScraper(
+    ParsePool(app.config['PARSE_WORKERS'], app.config['PARSE_MAX_PENDING']),
+    archive=PageArchive(app.config['PAGE_ARCHIVE_DIR']) if app.config['PAGE_ARCHIVE_DIR'] else None
+)
+enricher = JobEnricher(
+    scraper, cache,
+    budget=app.config['ENRICH_BUDGET_PER_SOURCE'],
+    wait=app.config['ENRICH_WAIT'],
+    rate_limit=app.config['ENRICH_RATE_LIMIT'],
+    rate_window=app.config['ENRICH_RATE_WINDOW'],
+    ttl=app.config['ENRICH_CACHE_TTL'],
+    failure_ttl=app.config['ENRICH_FAILURE_TTL']
+)
+corpus = JobCorpus(app.config['CORPUS_PATH'])
+facet_index = FacetIndex()
+market_analytics = MarketAnalytics()
+corpus.add_listener(facet_index.add_many)
+corpus.add_listener(market_analytics.add_many)
+corpus.refresh()
+saved_searches = SavedSearchIndex(app.config['SAVED_SEARCH_PATH'])
+saved_searches.refresh()
+corpus.add_listener(saved_searches.add_many)  # Term frequencies for alert anchors
+corpus.add_ingest_hook(AlertEngine(saved_searches, AlertDispatcher(app.config['ALERT_FLUSH_INTERVAL'])))
+assets = AssetManifest('static')
 cv_analyzer = CVAnalyzer()
 job_matcher = JobMatcher()
+def is_admin():
+    """Check the request's X-Admin-Token header against ADMIN_TOKEN"""
+    token = request.headers.get('X-Admin-Token', '')
+    admin_token = app.config['ADMIN_TOKEN']
+    # Compared as bytes: compare_digest rejects non-ASCII str (header values are latin-1)
+    return bool(admin_token) and hmac.compare_digest(token.encode('utf-8'), admin_token.encode('utf-8'))
+
+profiler = RequestProfiler(
+    app.config['PROFILE_DIR'],
+    max_profiles=app.config['PROFILE_MAX_FILES'],
+    slow_threshold=app.config['PROFILE_SLOW_THRESHOLD'],
+    is_admin=is_admin
+)
+
+@app.context_processor
+def inject_assets():
+    """Expose fingerprinted asset URLs to templates"""
+    return {'asset_url': assets.url, 'theme_urls': assets.theme_urls()}
 
 @app.route('/')
 def index():
@@ -277,6 +370,7 @@ def settings():
 
 @app.route('/api/v1/jobs/search', methods=['POST'])
 @limiter.limit("30 per minute")
+@profiler.profiled('search_jobs')
 async def search_jobs():
     """API endpoint for job search"""
     try:
@@ -288,18 +382,55 @@ async def search_jobs():
         
         # Check cache
         cache_key = f"jobs:{query}:{location}:{remote}"
-        cached = cache.get(cache_key)
+        stale = None
+        try:
+            cached = cache.get(cache_key)
+        except redis.RedisError as e:
+            logger.error(f"Cache read error: {e}")
+            CACHE_REQUESTS.labels('error').inc()
+            cached = None
+        else:
+            if not cached:
+                CACHE_REQUESTS.labels('miss').inc()
         if cached:
-            return jsonify(json.loads(cached))
+            cached = json.loads(cached)
+            age = time.time() - cached.pop('cached_at', 0)
+            if age < app.config['JOBS_CACHE_TTL']:
+                CACHE_REQUESTS.labels('hit').inc()
+                return jsonify(cached)
+            CACHE_REQUESTS.labels('stale').inc()
+            stale = cached
         
         # Scrape jobs
         jobs = await scraper.scrape_multiple(query, sources, location, remote)
         
-        # Match jobs if CV skills provided
+        # Fall back to the stale copy if every source came back empty
+        if not jobs and stale:
+            return jsonify(stale)
+        
+        # Match jobs if CV skills provided; cards only carry a title at first
         cv_skills = data.get('cv_skills', [])
         if cv_skills:
-            for job in jobs:
-                job['match_score'] = round(job_matcher.match(cv_skills, job['title']), 1)
+            with MATCH_SECONDS.time():
+                for job in jobs:
+                    job['match_score'] = round(job_matcher.match(cv_skills, job['title']), 1)
+            jobs.sort(key=lambda job: job['match_score'], reverse=True)
+        
+        # Fetch descriptions only for the top of the ranking, then rescore those;
+        # details that miss ENRICH_WAIT are cached for the next search instead
+        top_jobs = jobs[:app.config['ENRICH_TOP_N']]
+        if await enricher.enrich(top_jobs) and cv_skills:
+            with MATCH_SECONDS.time():
+                for job in top_jobs:
+                    text = f"{job['title']} {job.get('description', '')}"
+                    job['match_score'] = round(job_matcher.match(cv_skills, text), 1)
+            jobs.sort(key=lambda job: job['match_score'], reverse=True)
+        
+        # Persist to the corpus used by faceted search
+        try:
+            corpus.ingest(jobs)
+        except OSError as e:
+            logger.error(f"Corpus ingest error: {e}")
         
         response = {
             'success': True,
@@ -309,8 +440,12 @@ async def search_jobs():
             'timestamp': datetime.now().isoformat()
         }
         
-        # Cache for 5 minutes
-        cache.setex(cache_key, 300, json.dumps(response))
+        # Keep past the fresh TTL so a stale copy can be served if sources fail
+        try:
+            cache.setex(cache_key, app.config['JOBS_CACHE_STALE_TTL'],
+                        json.dumps(dict(response, cached_at=time.time())))
+        except redis.RedisError as e:
+            logger.error(f"Cache write error: {e}")
         
         return jsonify(response)
         
@@ -321,8 +456,102 @@ async def search_jobs():
             'error': str(e)
         }), 500
 
+@app.route('/api/v1/jobs/corpus/search', methods=['POST'])
+@limiter.limit("120 per minute")
+def search_corpus():
+    """Faceted search over previously ingested jobs"""
+    try:
+        data = request.get_json() or {}
+        try:
+            limit = min(int(data.get('limit', 20)), 100)
+            offset = int(data.get('offset', 0))
+            if limit < 0 or offset < 0:
+                raise ValueError('limit and offset must be non-negative')
+            filters = clean_filters(data.get('filters'), FacetIndex.FIELDS)
+            salary_min = clean_amount(data.get('salary_min'), 'salary_min')
+            salary_max = clean_amount(data.get('salary_max'), 'salary_max')
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        start = time.perf_counter()
+        corpus.refresh()
+        bitmap, facets = facet_index.search(filters, salary_min=salary_min, salary_max=salary_max)
+        count = bitmap.bit_count()
+        # Offsets past the end return nothing without walking the bitmap
+        ids = itertools.islice(iter_ids(bitmap), min(offset, count), min(offset + limit, count))
+        jobs = [corpus.get(doc_id) for doc_id in ids]
+        
+        return jsonify({
+            'success': True,
+            'count': count,
+            'jobs': jobs,
+            'facets': facets,
+            'took_ms': round((time.perf_counter() - start) * 1000, 3)
+        })
+        
+    except Exception as e:
+        logger.error(f"Corpus search error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/v1/insights', methods=['GET'])
+def get_insights():
+    """Market insights from rollups maintained at ingest time"""
+    corpus.refresh()
+    return jsonify({
+        'success': True,
+        'insights': market_analytics.insights()
+    })
+
+@app.route('/api/v1/alerts', methods=['POST'])
+@limiter.limit("10 per minute")
+def create_alert():
+    """Save a search and get notified about new matching jobs.
+    
+    The response carries an owner_token, required (as X-Alert-Token) to read
+    or delete the alert later.
+    """
+    data = request.get_json() or {}
+    try:
+        search = saved_searches.add(
+            query=data.get('query', ''),
+            filters=data.get('filters'),
+            salary_min=data.get('salary_min'),
+            notify_url=data.get('notify_url', '')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'success': True, 'alert': search}), 201
+
+def owned_alert(alert_id):
+    """Return the saved search if the request's X-Alert-Token (or admin token) owns it"""
+    search = saved_searches.get(alert_id)
+    if search is None:
+        return None
+    if is_admin() or saved_searches.is_owner(search, request.headers.get('X-Alert-Token', '')):
+        return search
+    return None
+
+@app.route('/api/v1/alerts/<alert_id>', methods=['GET'])
+def get_alert(alert_id):
+    """Get a saved search"""
+    search = owned_alert(alert_id)
+    if search is None:
+        return jsonify({'error': 'Alert not found'}), 404
+    return jsonify({'success': True, 'alert': saved_searches.public(search)})
+
+@app.route('/api/v1/alerts/<alert_id>', methods=['DELETE'])
+def delete_alert(alert_id):
+    """Delete a saved search"""
+    if owned_alert(alert_id) is None or not saved_searches.delete(alert_id):
+        return jsonify({'error': 'Alert not found'}), 404
+    return jsonify({'success': True})
+
 @app.route('/api/v1/cv/analyze', methods=['POST'])
 @limiter.limit("10 per minute")
+@profiler.profiled('analyze_cv')
 def analyze_cv():
     """API endpoint for CV analysis"""
     try:
@@ -331,13 +560,14 @@ def analyze_cv():
             if file.filename == '':
                 return jsonify({'error': 'No file selected'}), 400
             
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            # Read file content (simplified - in production, parse PDF/DOCX)
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                cv_text = f.read()
+            with CV_STAGE_SECONDS.labels('upload').time():
+                filename = secure_filename(file.filename)
+                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                file.save(filepath)
+                
+                # Read file content (simplified - in production, parse PDF/DOCX)
+                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                    cv_text = f.read()
         
         elif 'cv_text' in request.form:
             cv_text = request.form['cv_text']
@@ -346,7 +576,8 @@ def analyze_cv():
             return jsonify({'error': 'No CV data provided'}), 400
         
         # Analyze CV
-        analysis = cv_analyzer.analyze(cv_text)
+        with CV_STAGE_SECONDS.labels('total').time():
+            analysis = cv_analyzer.analyze(cv_text)
         
         # Get sample job matches
         sample_jobs = [
@@ -385,22 +616,94 @@ def get_themes():
     ]
     return jsonify({'themes': themes})
 
+async def probe_source(session, name, url):
+    """Measure round-trip latency to a job source"""
+    start = time.perf_counter()
+    try:
+        async with session.get(url, headers=scraper.headers, allow_redirects=False) as response:
+            status = 'operational' if response.status < 500 else 'degraded'
+            detail = {'http_status': response.status}
+    except Exception as e:
+        status, detail = 'down', {'error': str(e)}
+    latency = time.perf_counter() - start
+    PROBE_SECONDS.labels(name).observe(latency)
+    return name, dict(detail, status=status, latency_ms=round(latency * 1000, 1))
+
+# Last job source probe results, shared by health checks within HEALTH_SOURCE_TTL
+source_probes = {'checked_at': 0, 'sources': None}
+
+async def probe_sources():
+    """Probe the job sources, reusing recent results so frequent polling stays local"""
+    if source_probes['sources'] and time.time() - source_probes['checked_at'] < app.config['HEALTH_SOURCE_TTL']:
+        return source_probes['sources']
+    
+    timeout = aiohttp.ClientTimeout(total=app.config['HEALTH_PROBE_TIMEOUT'])
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        sources = dict(await asyncio.gather(
+            probe_source(session, 'linkedin', 'https://www.linkedin.com/jobs/search/'),
+            probe_source(session, 'indeed', 'https://www.indeed.com/jobs')
+        ))
+    source_probes.update(checked_at=time.time(), sources=sources)
+    return sources
+
+def probe_cache():
+    """Measure Redis round-trip latency with a PING"""
+    start = time.perf_counter()
+    try:
+        health_cache.ping()
+        result = {'status': 'operational'}
+    except redis.RedisError as e:
+        result = {'status': 'down', 'error': str(e)}
+    latency = time.perf_counter() - start
+    PROBE_SECONDS.labels('redis').observe(latency)
+    result['latency_ms'] = round(latency * 1000, 1)
+    return result
+
 @app.route('/api/v1/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
+@limiter.exempt
+async def health_check():
+    """Health check endpoint with live dependency probes"""
+    sources = await probe_sources()
+    
+    services = {
+        'cache': probe_cache(),
+        'sources': sources
+    }
+    checks = [services['cache']] + list(sources.values())
+    healthy = all(check['status'] == 'operational' for check in checks)
+    
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if healthy else 'degraded',
         'timestamp': datetime.now().isoformat(),
-        'services': {
-            'scraping': 'operational',
-            'cv_analysis': 'operational',
-            'cache': 'operational'
-        }
+        'services': services
     })
 
+@app.route('/api/v1/metrics', methods=['GET'])
+@limiter.exempt
+def metrics():
+    """Prometheus metrics endpoint"""
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
+
+@app.route('/api/v1/admin/profiles', methods=['GET'])
+def list_profiles():
+    """List captured request profiles"""
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    return jsonify({'profiles': profiler.list_profiles()})
+
+@app.route('/api/v1/admin/profiles/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    """Download a captured profile"""
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    return send_from_directory(os.path.abspath(profiler.profile_dir), profile_id, as_attachment=True)
+
 @app.route('/static/<path:path>')
 def serve_static(path):
-    """Serve static files"""
+    """Serve static files; fingerprinted builds get immutable caching"""
+    if path.startswith('dist/'):
+        return assets.send(path[len('dist/'):])
     return send_from_directory('static', path)
 
 if __name__ == '__main__':
@@ -0,0 +1,30 @@
+# gunicorn.conf.py - loaded automatically by gunicorn from the working directory
+import os
+import glob
+import tempfile
+
+# Workers write their metric samples here so /api/v1/metrics can aggregate them
+prometheus_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), 'careerintel-metrics')
+)
+
+
+def on_starting(server):
+    """Start every master with an empty metrics directory and fresh asset build"""
+    os.makedirs(prometheus_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(prometheus_dir, '*.db')):
+        os.remove(path)
+    
+    # Built once here, before workers load the manifest
+    try:
+        from utils.assets import build
+        build('static')
+    except OSError as e:
+        server.log.error(f"Asset build failed, serving unfingerprinted assets: {e}")
+
+
+def child_exit(server, worker):
+    """Drop live gauges of workers that have exited"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
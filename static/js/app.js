@@ -27,7 +27,7 @@ class CareerIntel {
     static setTheme(themeName) {
         const themeCSS = document.getElementById('theme-css');
         if (themeCSS) {
-            themeCSS.href = `/static/css/themes/${themeName}.css`;
+            themeCSS.href = (window.THEME_URLS || {})[themeName] || `/static/css/themes/${themeName}.css`;
             document.documentElement.setAttribute('data-theme', themeName);
             this.config.currentTheme = themeName;
             localStorage.setItem('careerintel_theme', themeName);
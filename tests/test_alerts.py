@@ -0,0 +1,127 @@
+import pytest
+from utils.alerts import SavedSearchIndex, AlertEngine
+
+
+def job(title, work_mode='Remote', location='Berlin', salary_max=None, skills=()):
+    return {
+        'title': title,
+        'description': '',
+        'skills': list(skills),
+        'work_mode': work_mode,
+        'location_normalized': location,
+        'seniority': 'Senior' if 'senior' in title.lower() else 'Mid Level',
+        'source': 'LinkedIn',
+        'salary_min': salary_max,
+        'salary_max': salary_max
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SavedSearchIndex(str(tmp_path / 'saved_searches.jsonl'))
+
+
+def matched(index, job_data):
+    return sorted(search['query'] or str(search['filters']) for search in index.percolate(job_data))
+
+
+def test_candidates_come_from_anchor_keys(index):
+    search = index.add(query='python engineer')
+    other = index.add(filters={'location': ['Paris']})
+
+    tokens = index.job_terms(job('Python Engineer'))
+    assert search['id'] in index.candidates(tokens, index.job_values(job('Python Engineer')))
+    assert other['id'] not in index.candidates(tokens, index.job_values(job('Python Engineer')))
+    assert other['id'] in index.candidates(set(), index.job_values(job('Chef', location='Paris')))
+    assert index.candidates({'chef'}, {}) == set()
+
+
+def test_all_terms_must_be_present(index):
+    index.add(query='senior python engineer')
+    assert matched(index, job('Senior Python Engineer')) == ['senior python engineer']
+    assert matched(index, job('Python Engineer')) == []
+    # Terms may come from skills as well as the title
+    assert matched(index, job('Senior Engineer', skills=['python'])) == ['senior python engineer']
+
+
+def test_facet_filters_are_verified(index):
+    index.add(query='python', filters={'work_mode': ['Remote', 'Hybrid'], 'location': ['berlin']})
+    assert matched(index, job('Python Dev', work_mode='Hybrid')) == ['python']
+    assert matched(index, job('Python Dev', work_mode='On-site')) == []
+    assert matched(index, job('Python Dev', location='Paris')) == []
+
+
+def test_salary_minimum_is_verified(index):
+    index.add(query='python', salary_min=100000)
+    assert matched(index, job('Python Dev', salary_max=120000)) == ['python']
+    assert matched(index, job('Python Dev', salary_max=90000)) == []
+    assert matched(index, job('Python Dev')) == []
+
+
+def test_delete_removes_search_from_every_worker(index, tmp_path):
+    search = index.add(query='python')
+    other_worker = SavedSearchIndex(index.log.path)
+    other_worker.refresh()
+    assert matched(other_worker, job('Python Dev')) == ['python']
+
+    assert index.delete(search['id'])
+    assert not index.delete(search['id'])
+    other_worker.refresh()
+    assert matched(index, job('Python Dev')) == []
+    assert matched(other_worker, job('Python Dev')) == []
+    assert other_worker.get(search['id']) is None
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'query': 'python', 'salary_min': '100k'},
+    {'filters': {'work_mode': 'Remote'}},
+    {'filters': {'work_mode': [1]}},
+    {'filters': {'foo': ['x']}},
+    {'query': '', 'filters': {'work_mode': []}},
+    {'query': ['python']},
+])
+def test_invalid_searches_are_rejected(index, kwargs):
+    with pytest.raises(ValueError):
+        index.add(**kwargs)
+
+
+def test_malformed_stored_search_does_not_break_matching(index):
+    index.log.append([{'op': 'add', 'search': {
+        'id': 'bad', 'query': '', 'terms': [], 'filters': {}, 'salary_min': '100k', 'notify_url': ''
+    }}])
+    index.add(query='python')
+
+    delivered = []
+
+    class Dispatcher:
+        def enqueue(self, search, job_data):
+            delivered.append((search['query'], job_data['title']))
+
+    AlertEngine(index, Dispatcher())([job('Python Dev'), job('Python Lead')])
+    assert delivered == [('python', 'Python Dev'), ('python', 'Python Lead')]
+
+
+def test_anchor_is_rarest_term_not_longest(index):
+    index.add_many(0, [job('Python Developer')] * 50 + [job('Django Developer', skills=['python'])])
+    assert index.add(query='senior python engineer')['anchors'] == ['python']
+    assert index.add(query='react developer')['anchors'] == ['react']
+    # 'python' is in 51 corpus jobs, 'django' in one
+    assert index.add(query='python django')['anchors'] == ['django']
+
+
+def test_common_title_job_retrieves_small_candidate_set(index):
+    techs = ['python', 'java', 'react', 'golang', 'rust', 'kotlin', 'swift', 'scala', 'ruby', 'php',
+             'django', 'flask', 'spring', 'angular', 'vue', 'node.js', 'aws', 'azure', 'terraform', 'kafka']
+    titles = ['engineer', 'developer', 'senior engineer', 'lead developer', 'software engineer']
+    # The corpus is dominated by generic title words
+    index.add_many(0, [job(f"Senior {tech} Engineer") for tech in techs for _ in range(5)])
+    searches = [f"{title} {tech}" for _ in range(10) for tech in techs for title in titles]
+    for query in searches:
+        index.add(query=query)
+
+    common = job('Senior Software Engineer', skills=['java'])
+    candidates = index.candidates(index.job_terms(common), index.job_values(common))
+    assert len(searches) == 1000
+    # Only the 50 searches anchored on 'java' are looked at, not every 'engineer' search
+    assert len(candidates) == 50
+    assert len(index.percolate(common)) == 30  # The 'engineer', 'senior engineer' and 'software engineer' titles
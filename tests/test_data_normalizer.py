@@ -0,0 +1,37 @@
+import pytest
+from utils.data_normalizer import JobNormalizer
+
+
+@pytest.mark.parametrize('salary, expected', [
+    ('', (None, None)),
+    ('Competitive', (None, None)),
+    ('$100,000 - $120,000', (100000, 120000)),
+    ('$100k - $120k', (100000, 120000)),
+    ('90K+', (90000, 90000)),
+    ('€60.000 - €70.000 a year', (60000, 70000)),
+    ('£45,000 per annum', (45000, 45000)),
+    ('$25 - $30 an hour', (52000, 62400)),
+    ('$25 - 30', (52000, 62400)),
+    ('$5,000 - $6,000 a month', (60000, 72000)),
+    ('$1.2M', (1200000, 1200000)),
+    ('2 years experience $70k', (70000, 70000)),
+    ('$70k, 40 hours a week', (70000, 70000)),
+    ('Up to $120,000 with 5+ years', (120000, 120000)),
+    ('$20 - $150,000', (None, None)),
+    ('$120,000.00 - $140,000.00', (120000, 140000)),
+    ('€55.000,00 per year', (55000, 55000)),
+    ('₹5,00,000 - ₹8,00,000 a year', (None, None)),
+    ('$500 a year', (None, None)),
+])
+def test_parse_salary(salary, expected):
+    assert JobNormalizer.parse_salary(salary) == expected
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('', ''),
+    ('https://www.linkedin.com/jobs/view/123/?refId=a&trackingId=b&position=3#x',
+     'https://www.linkedin.com/jobs/view/123'),
+    ('https://indeed.com/rc/clk?jk=abc&fccid=z&vjs=3', 'https://indeed.com/rc/clk?jk=abc'),
+])
+def test_canonical_url(url, expected):
+    assert JobNormalizer.canonical_url(url) == expected
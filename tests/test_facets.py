@@ -0,0 +1,85 @@
+import pytest
+from utils.facets import FacetIndex, SalaryIndex, iter_ids, clean_filters
+
+
+def job(work_mode, seniority, source='LinkedIn', location='Berlin', salary=None):
+    low, high = salary or (None, None)
+    return {
+        'work_mode': work_mode,
+        'seniority': seniority,
+        'source': source,
+        'location_normalized': location,
+        'salary_min': low,
+        'salary_max': high
+    }
+
+
+@pytest.fixture
+def index():
+    index = FacetIndex(salary_bucket=5000)
+    index.add_many(0, [
+        job('Remote', 'Senior', salary=(90000, 110000)),
+        job('Remote', 'Mid Level', source='Indeed', salary=(60000, 70000)),
+        job('Hybrid', 'Senior', location='Paris'),
+    ])
+    index.add_many(3, [
+        job('On-site', 'Senior', source='Indeed', salary=(100000, 100000)),
+        job('Remote', 'Entry Level', location='Paris', salary=(40000, 45000)),
+    ])
+    return index
+
+
+def ids(bitmap):
+    return sorted(iter_ids(bitmap))
+
+
+def test_combined_filters_intersect_across_fields_and_union_within(index):
+    bitmap, _ = index.search({'work_mode': ['remote', 'hybrid'], 'seniority': ['Senior']})
+    assert ids(bitmap) == [0, 2]
+
+
+def test_no_filters_match_everything(index):
+    bitmap, facets = index.search()
+    assert ids(bitmap) == [0, 1, 2, 3, 4]
+    assert facets['work_mode'] == {'Remote': 3, 'Hybrid': 1, 'On-site': 1}
+
+
+def test_facet_counts_are_disjunctive(index):
+    _, facets = index.search({'work_mode': ['Remote'], 'seniority': ['Senior']})
+    # work_mode counts ignore the work_mode filter but honour seniority
+    assert facets['work_mode'] == {'Remote': 1, 'Hybrid': 1, 'On-site': 1}
+    # seniority counts ignore the seniority filter but honour work_mode
+    assert facets['seniority'] == {'Senior': 1, 'Mid Level': 1, 'Entry Level': 1}
+    assert facets['source'] == {'LinkedIn': 1}
+
+
+def test_salary_filters(index):
+    assert ids(index.search(salary_min=100000)[0]) == [0, 3]
+    assert ids(index.search(salary_max=60000)[0]) == [1, 4]
+    assert ids(index.search(salary_min=65000, salary_max=95000)[0]) == [0, 1]
+
+
+def test_salary_index_boundary_bucket():
+    salaries = SalaryIndex(bucket_size=5000)
+    salaries.add_many([(0, 4999), (1, 5000), (2, 7499), (3, 7500), (4, 9999), (5, 10000)])
+    # 7500 falls inside bucket 1 (5000-9999): only its members are compared one by one
+    assert ids(salaries.at_least(7500)) == [3, 4, 5]
+    assert ids(salaries.at_most(7500)) == [0, 1, 2, 3]
+    assert ids(salaries.at_least(5000)) == [1, 2, 3, 4, 5]
+    assert ids(salaries.at_most(4999)) == [0]
+    assert ids(salaries.at_least(10001)) == []
+
+
+@pytest.mark.parametrize('filters', [
+    'Remote',
+    {'work_mode': 'Remote'},
+    {'work_mode': [1]},
+    {'unknown': ['x']},
+])
+def test_clean_filters_rejects_malformed_input(filters):
+    with pytest.raises(ValueError):
+        clean_filters(filters, FacetIndex.FIELDS)
+
+
+def test_clean_filters_drops_empty_lists():
+    assert clean_filters({'work_mode': [], 'seniority': ['Senior']}, FacetIndex.FIELDS) == {'seniority': ['Senior']}
@@ -0,0 +1,92 @@
+import random
+import pytest
+from ai_models.job_matcher import JobMatchingEngine
+
+
+def scores(cv_data, jobs, component, **kwargs):
+    engine = JobMatchingEngine(**kwargs)
+    index = engine.build_index(jobs)
+    return [round(float(score), 3) for score in engine.score_components(cv_data, index)[component]]
+
+
+def test_skill_match_is_share_of_job_skills_covered():
+    jobs = [{'title': 'A', 'skills': ['python', 'sql']}, {'title': 'B', 'skills': ['java']}, {'title': 'C'}]
+    assert scores({'skills': ['Python']}, jobs, 'skills') == [0.5, 0.0, 0.0]
+
+
+def test_title_relevance_is_share_of_target_tokens():
+    jobs = [{'title': 'Senior Python Engineer'}, {'title': 'Python Developer'}, {'title': 'Data Analyst'}]
+    assert scores({'target_title': 'python engineer'}, jobs, 'title') == [1.0, 0.5, 0.0]
+    assert scores({}, jobs, 'title') == [0.0, 0.0, 0.0]
+
+
+def test_title_relevance_has_no_false_matches():
+    # Previously hashed into 256 bits, so unrelated tokens could collide
+    jobs = [{'title': f"role{i}"} for i in range(2000)]
+    assert set(scores({'target_title': 'python'}, jobs, 'title')) == {0.0}
+
+
+def test_experience_by_level_distance_with_unknown_default():
+    jobs = [
+        {'title': 'Senior Engineer'},
+        {'title': 'Engineer'},
+        {'title': 'Junior Engineer'},
+        {'title': 'Engineer', 'experience_level': 'Intern'}
+    ]
+    assert scores({'experience_years': 6}, jobs, 'experience') == [1.0, 0.6, 0.2, 0.5]
+    assert scores({}, jobs, 'experience') == [0.5, 0.5, 0.5, 0.5]
+
+
+def test_location_score():
+    jobs = [
+        {'title': 'A', 'location': 'Berlin, Germany', 'work_mode': 'On-site'},
+        {'title': 'B', 'location': 'Paris', 'work_mode': 'Hybrid'},
+        {'title': 'C', 'location': 'Paris', 'work_mode': 'Remote'},
+        {'title': 'D', 'location': 'Paris', 'work_mode': 'On-site'}
+    ]
+    assert scores({'preferred_locations': ['berlin']}, jobs, 'location') == [1.0, 0.5, 1.0, 0.0]
+    assert scores({}, jobs, 'location') == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_salary_alignment_parses_text_with_unknown_default():
+    jobs = [
+        {'title': 'A', 'salary_range': (80000, 90000)},
+        {'title': 'B', 'salary_range': '$100k - $120k'},
+        {'title': 'C', 'salary': '$40 - $45 an hour'},
+        {'title': 'D'}
+    ]
+    assert scores({'expected_salary': 100000}, jobs, 'salary') == [0.9, 1.0, 0.936, 0.5]
+    assert scores({}, jobs, 'salary') == [0.5, 0.5, 0.5, 0.5]
+
+
+def test_company_prestige_defaults_to_half():
+    jobs = [{'title': 'A', 'company': 'Acme'}, {'title': 'B', 'company': 'Unknown'}]
+    assert scores({}, jobs, 'company_prestige', company_scores={'Acme': 0.9}) == [0.9, 0.5]
+
+
+def test_top_k_matches_full_sort():
+    rng = random.Random(7)
+    words = ['python', 'java', 'senior', 'data', 'engineer', 'developer', 'sql', 'aws']
+    jobs = [
+        {'title': ' '.join(rng.sample(words, 3)), 'skills': rng.sample(words, 3),
+         'salary_range': (rng.randrange(50, 150) * 1000, 160000)}
+        for _ in range(500)
+    ]
+    cv_data = {'skills': ['python', 'sql'], 'target_title': 'senior python engineer', 'expected_salary': 120000}
+    engine = JobMatchingEngine()
+    index = engine.build_index(jobs)
+
+    full = engine.match_jobs_to_cv(cv_data, index, top_k=None)
+    top = engine.match_jobs_to_cv(cv_data, index, top_k=10)
+    assert len(full) == 500
+    assert [job['match_score'] for job in top] == [job['match_score'] for job in full[:10]]
+    assert [job['match_score'] for job in full] == sorted((job['match_score'] for job in full), reverse=True)
+
+
+def test_empty_index():
+    assert JobMatchingEngine().match_jobs_to_cv({'skills': ['python']}, []) == []
+
+
+def test_negative_top_k_is_rejected():
+    with pytest.raises(ValueError):
+        JobMatchingEngine().match_jobs_to_cv({}, [{'title': 'A'}, {'title': 'B'}], top_k=-1)
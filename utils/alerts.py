@@ -0,0 +1,326 @@
+import re
+import hmac
+import time
+import uuid
+import socket
+import hashlib
+import logging
+import secrets
+import ipaddress
+import threading
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+import requests
+from utils.append_log import AppendLog
+from utils.background import LazyThread
+from utils.facets import clean_filters, clean_amount
+
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r'[a-z0-9+#.]+')
+
+# Words in most job postings; never chosen as an anchor while a search has other terms
+GENERIC_TERMS = {
+    'engineer', 'engineering', 'developer', 'development', 'software', 'senior', 'sr', 'junior',
+    'jr', 'lead', 'staff', 'principal', 'manager', 'head', 'director', 'specialist', 'analyst',
+    'consultant', 'associate', 'architect', 'intern', 'remote', 'hybrid', 'full', 'part', 'time',
+    'stack', 'team', 'the', 'and', 'of', 'for', 'in', 'with', 'a', 'to'
+}
+
+# Facets in order of preference as an index key when a search has no terms
+FACET_FIELDS = {
+    'location': 'location_normalized',
+    'seniority': 'seniority',
+    'work_mode': 'work_mode',
+    'source': 'source'
+}
+
+
+def tokenize(text):
+    return set(TOKEN.findall(text.lower()))
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def check_webhook_url(url):
+    """Raise ValueError unless url is http(s) and its host resolves only to public addresses.
+
+    Run when a search is saved and again before every delivery, so a webhook
+    cannot be aimed at loopback, link-local (cloud metadata) or private
+    network services, including by re-pointing its DNS later.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError('notify_url must be an http(s) URL')
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)}
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(f"notify_url host does not resolve: {parts.hostname}")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%')[0])
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError('notify_url must not point to a private, loopback or link-local address')
+
+
+class SavedSearchIndex:
+    """Reverse (percolator) index of saved searches.
+
+    Each saved search is filed under a single anchor key: its rarest required
+    term, or failing that the values of its most selective facet. Rarity is
+    the term's document frequency in the job corpus (the index is a corpus
+    listener), with generic job words ranked last and ties going to the
+    smaller existing bucket. A new job only looks up the keys it actually
+    contains, then fully verifies that small candidate set, so ingest cost
+    depends on how many searches could match rather than on how many
+    searches exist. The anchor is chosen once, when the search is saved, and
+    stored with it so every worker files it identically.
+
+    Searches are persisted as add/delete records in an AppendLog and, like
+    JobCorpus, each worker catches up with refresh().
+    """
+
+    def __init__(self, path):
+        self.log = AppendLog(path)
+        self.searches = {}
+        self.index = defaultdict(set)
+        self.match_all = set()
+        self.term_counts = Counter()  # Corpus document frequency of each term
+        self._lock = threading.RLock()
+
+    def add_many(self, start_id, jobs):
+        """JobCorpus listener: count term document frequencies for anchor selection"""
+        with self._lock:
+            for job in jobs:
+                self.term_counts.update(self.job_terms(job))
+
+    def choose_anchor(self, terms):
+        """The term a search's matches are rarest in, so the fewest jobs look it up"""
+        with self._lock:
+            return min(terms, key=lambda term: (
+                term in GENERIC_TERMS,
+                self.term_counts[term],
+                len(self.index.get(term, ())),
+                -len(term),
+                term
+            ))
+
+    @staticmethod
+    def anchor_keys(search):
+        if search.get('anchors') is not None:
+            return search['anchors']
+        # Searches saved before anchors were stored were filed under their longest term
+        if search['terms']:
+            return [max(search['terms'], key=len)]
+        for field in FACET_FIELDS:
+            if search['filters'].get(field):
+                return [f"{field}:{value}" for value in search['filters'][field]]
+        return []
+
+    def _apply(self, record):
+        search = record['search']
+        if record['op'] == 'add':
+            # Records written before validation existed may be malformed
+            clean_filters(search['filters'], FACET_FIELDS)
+            clean_amount(search['salary_min'], 'salary_min')
+            self.searches[search['id']] = search
+            keys = self.anchor_keys(search)
+            for key in keys:
+                self.index[key].add(search['id'])
+            if not keys:
+                self.match_all.add(search['id'])
+        elif record['op'] == 'delete' and search['id'] in self.searches:
+            for key in self.anchor_keys(self.searches.pop(search['id'])):
+                self.index[key].discard(search['id'])
+            self.match_all.discard(search['id'])
+
+    def refresh(self):
+        """Load add/delete records appended since the last refresh"""
+        with self._lock:
+            for record in self.log.read_new():
+                try:
+                    self._apply(record)
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def _append(self, record):
+        self.log.append([record])
+        self.refresh()
+
+    def add(self, query='', filters=None, salary_min=None, notify_url=''):
+        """Save a search and return it with its owner token, raising ValueError on bad input.
+
+        The owner token is only returned here; just its hash is stored.
+        """
+        if not isinstance(query, str):
+            raise ValueError('query must be a string')
+        filters = {
+            field: [value.lower() for value in values]
+            for field, values in clean_filters(filters, FACET_FIELDS).items()
+        }
+        salary_min = clean_amount(salary_min, 'salary_min')
+        terms = sorted(tokenize(query))
+        if not terms and not filters and not salary_min:
+            raise ValueError('A query or filters are required')
+        if notify_url:
+            check_webhook_url(notify_url)
+
+        token = secrets.token_urlsafe(24)
+        search = {
+            'id': uuid.uuid4().hex,
+            'query': query,
+            'terms': terms,
+            'anchors': [self.choose_anchor(terms)] if terms else None,
+            'filters': filters,
+            'salary_min': salary_min,
+            'notify_url': notify_url,
+            'owner_hash': hash_token(token),
+            'created': time.time()
+        }
+        with self._lock:
+            self._append({'op': 'add', 'search': search})
+        return dict(self.public(search), owner_token=token)
+
+    @staticmethod
+    def public(search):
+        """A saved search without its owner hash, for API responses"""
+        return {key: value for key, value in search.items() if key != 'owner_hash'}
+
+    @staticmethod
+    def is_owner(search, token):
+        owner_hash = search.get('owner_hash')
+        return bool(owner_hash and token) and hmac.compare_digest(hash_token(token), owner_hash)
+
+    def delete(self, search_id):
+        with self._lock:
+            self.refresh()
+            if search_id not in self.searches:
+                return False
+            self._append({'op': 'delete', 'search': {'id': search_id}})
+        return True
+
+    def get(self, search_id):
+        self.refresh()
+        return self.searches.get(search_id)
+
+    @staticmethod
+    def job_terms(job):
+        return tokenize(f"{job.get('title', '')} {job.get('description', '')} {' '.join(job.get('skills') or [])}")
+
+    @staticmethod
+    def job_values(job):
+        return {field: (job.get(key) or '').lower() for field, key in FACET_FIELDS.items()}
+
+    def candidates(self, tokens, values):
+        """Ids of the saved searches filed under any key a job contains"""
+        with self._lock:
+            candidates = set(self.match_all)
+            for token in tokens:
+                candidates.update(self.index.get(token, ()))
+            for field, value in values.items():
+                candidates.update(self.index.get(f"{field}:{value}", ()))
+            return candidates
+
+    def percolate(self, job):
+        """Return the saved searches a normalized job satisfies"""
+        tokens = self.job_terms(job)
+        values = self.job_values(job)
+        with self._lock:
+            searches = [self.searches[search_id] for search_id in self.candidates(tokens, values)]
+
+        matches = []
+        for search in searches:
+            if not tokens.issuperset(search['terms']):
+                continue
+            if any(values[field] not in allowed for field, allowed in search['filters'].items()):
+                continue
+            if search['salary_min'] and (job.get('salary_max') or 0) < search['salary_min']:
+                continue
+            matches.append(search)
+        return matches
+
+
+class AlertDispatcher:
+    """Batches saved-search matches and delivers them per search.
+
+    Matches are buffered and flushed every `interval` seconds, or as soon as
+    `batch_size` matches are pending, as one webhook POST per saved search
+    listing all of its new jobs. Searches without a webhook are logged.
+    """
+
+    def __init__(self, interval=60, batch_size=500, timeout=10):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.pending = defaultdict(list)
+        self.pending_count = 0
+        self.searches = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = LazyThread(self._run, 'alert-dispatcher')
+
+    def enqueue(self, search, job):
+        with self._lock:
+            self.searches[search['id']] = search
+            self.pending[search['id']].append(job)
+            self.pending_count += 1
+            self._thread.ensure_started()
+            if self.pending_count >= self.batch_size:
+                self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self.pending = self.pending, defaultdict(list)
+            searches, self.searches = self.searches, {}
+            self.pending_count = 0
+
+        for search_id, jobs in pending.items():
+            search = searches[search_id]
+            payload = {
+                'search_id': search_id,
+                'query': search['query'],
+                'count': len(jobs),
+                'jobs': [
+                    {key: job.get(key) for key in ('title', 'company', 'location', 'work_mode', 'salary', 'apply_url', 'source')}
+                    for job in jobs
+                ]
+            }
+            if not search.get('notify_url'):
+                logger.info(f"Alert for saved search {search_id}: {len(jobs)} new jobs")
+                continue
+            try:
+                check_webhook_url(search['notify_url'])
+                # Redirects are not followed: they could lead to an internal address
+                requests.post(search['notify_url'], json=payload, timeout=self.timeout, allow_redirects=False)
+            except ValueError as e:
+                logger.warning(f"Alert delivery refused for {search_id}: {e}")
+            except requests.RequestException as e:
+                logger.error(f"Alert delivery error for {search_id}: {e}")
+
+
+class AlertEngine:
+    """JobCorpus ingest hook matching new jobs against saved searches"""
+
+    def __init__(self, index, dispatcher):
+        self.index = index
+        self.dispatcher = dispatcher
+
+    def __call__(self, jobs):
+        self.index.refresh()
+        for job in jobs:
+            # One failing job must not keep the rest of the batch from matching
+            try:
+                matches = self.index.percolate(job)
+            except Exception as e:
+                logger.error(f"Percolate error for {job.get('apply_url', '')}: {e}")
+                continue
+            for search in matches:
+                self.dispatcher.enqueue(search, job)
@@ -0,0 +1,147 @@
+import math
+import threading
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+
+class SalarySketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch-style).
+
+    Values fall into logarithmic buckets of ratio `gamma`, so any quantile is
+    returned within `relative_accuracy` of the true value, memory grows with
+    the log of the salary range rather than the number of postings, and two
+    sketches merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.count = 0
+
+    def add(self, value):
+        if value > 0:
+            self.buckets[math.ceil(math.log(value) / self.log_gamma)] += 1
+            self.count += 1
+
+    def merge(self, other):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return round(2 * self.gamma ** key / (self.gamma + 1))
+        return None
+
+    def summary(self, quantiles=(0.1, 0.25, 0.5, 0.75, 0.9)):
+        return {
+            'count': self.count,
+            **{f"p{round(q * 100)}": self.quantile(q) for q in quantiles}
+        }
+
+
+class MarketAnalytics:
+    """Market rollups maintained incrementally as jobs enter the corpus.
+
+    Registered as a JobCorpus listener, so every normalized job updates skill
+    demand, skill co-occurrence, salary sketches (overall, per seniority and
+    per skill) and daily posting volume by location and seniority. Reads
+    never touch the corpus: insights() serves a snapshot derived from these
+    aggregates, rebuilt only after new jobs arrive or the day changes.
+    """
+
+    WINDOWS = (7, 30)
+
+    def __init__(self, top=20):
+        self.top = top
+        self.total = 0
+        self.skill_counts = Counter()
+        self.cooccurrence = defaultdict(Counter)  # skill -> co-listed skill counts
+        self.salaries = defaultdict(SalarySketch)
+        self.daily = defaultdict(lambda: {'total': 0, 'location': Counter(), 'seniority': Counter()})
+        self._snapshot = None
+        self._snapshot_day = None
+        self._lock = threading.Lock()
+
+    def add_many(self, start_id, jobs):
+        """JobCorpus listener: fold a batch of normalized jobs into the rollups"""
+        with self._lock:
+            for job in jobs:
+                skills = sorted(set(job.get('skills') or []))
+                self.total += 1
+                self.skill_counts.update(skills)
+                for skill in skills:
+                    self.cooccurrence[skill].update(other for other in skills if other != skill)
+
+                if job.get('salary_max') is not None:
+                    midpoint = (job['salary_min'] + job['salary_max']) / 2
+                    self.salaries['all'].add(midpoint)
+                    self.salaries['seniority:' + (job.get('seniority') or 'Mid Level')].add(midpoint)
+                    for skill in skills:
+                        self.salaries['skill:' + skill].add(midpoint)
+
+                day = self.daily[(job.get('posted_date') or '')[:10]]
+                day['total'] += 1
+                day['location'][job.get('location_normalized') or 'Not specified'] += 1
+                day['seniority'][job.get('seniority') or 'Not specified'] += 1
+            self._snapshot = None
+
+    def insights(self):
+        """Return the current rollup snapshot"""
+        today = date.today()
+        with self._lock:
+            if self._snapshot is None or self._snapshot_day != today:
+                self._snapshot = self._build_snapshot(today)
+                self._snapshot_day = today
+            return self._snapshot
+
+    def _build_snapshot(self, today):
+        top_skills = [skill for skill, _ in self.skill_counts.most_common(self.top)]
+
+        volume = {}
+        for days in self.WINDOWS:
+            since = (today - timedelta(days=days - 1)).isoformat()
+            window = {'total': 0, 'location': Counter(), 'seniority': Counter()}
+            for day, counts in self.daily.items():
+                if day >= since:
+                    window['total'] += counts['total']
+                    window['location'].update(counts['location'])
+                    window['seniority'].update(counts['seniority'])
+            volume[f"{days}d"] = {
+                'total': window['total'],
+                'by_location': dict(window['location'].most_common(self.top)),
+                'by_seniority': dict(window['seniority'])
+            }
+
+        return {
+            'total_jobs': self.total,
+            'skill_demand': [
+                {
+                    'skill': skill,
+                    'count': self.skill_counts[skill],
+                    'share': round(self.skill_counts[skill] / self.total, 4),
+                    'related': [
+                        {'skill': other, 'count': count}
+                        for other, count in self.cooccurrence[skill].most_common(5)
+                    ],
+                    'salary': self.salaries['skill:' + skill].summary() if 'skill:' + skill in self.salaries else None
+                }
+                for skill in top_skills
+            ],
+            'salary': {
+                'all': self.salaries['all'].summary() if 'all' in self.salaries else None,
+                'by_seniority': {
+                    key.split(':', 1)[1]: sketch.summary()
+                    for key, sketch in self.salaries.items() if key.startswith('seniority:')
+                }
+            },
+            'posting_volume': volume,
+            'generated_at': today.isoformat()
+        }
@@ -0,0 +1,50 @@
+import os
+import json
+
+
+class AppendLog:
+    """Append-only JSON-lines file shared by gunicorn workers.
+
+    Each writer appends a batch with a single O_APPEND write, which keeps
+    concurrent workers' lines whole. Each reader remembers its byte offset
+    and read_new() returns only the records appended since its last call,
+    leaving a partially written last line for the next one. Callers provide
+    their own locking.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+
+    def read_new(self):
+        """Return records appended since the last call, skipping unreadable lines"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # Torn line from a crashed writer
+        return records
+
+    def append(self, records):
+        data = ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+        if not data:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
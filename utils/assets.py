@@ -0,0 +1,147 @@
+import os
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import mimetypes
+from flask import request, send_file, abort
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are skipped when the package is missing
+    brotli = None
+
+ASSET_DIRS = ('css', 'js')
+ONE_YEAR = 365 * 24 * 3600
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def fingerprint(path, digest):
+    """css/main.css -> css/main.<digest>.css"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{digest}{ext}"
+
+
+def build(static_dir='static', clean=False):
+    """Fingerprint and precompress static assets into <static_dir>/dist.
+
+    Writes each CSS/JS file under a content-hashed name with .gz (and .br
+    when brotli is installed) siblings, plus a manifest.json mapping the
+    logical path to the hashed one. Older build files are left on disk
+    unless `clean`; only the current manifest's files are served.
+    """
+    dist_dir = os.path.join(static_dir, 'dist')
+    if clean:
+        shutil.rmtree(dist_dir, ignore_errors=True)
+
+    manifest = {}
+    for asset_dir in ASSET_DIRS:
+        for root, _, files in os.walk(os.path.join(static_dir, asset_dir)):
+            for name in sorted(files):
+                source = os.path.join(root, name)
+                logical = os.path.relpath(source, static_dir).replace(os.sep, '/')
+                with open(source, 'rb') as f:
+                    data = f.read()
+                hashed = fingerprint(logical, hashlib.sha256(data).hexdigest()[:12])
+                manifest[logical] = hashed
+
+                target = os.path.join(dist_dir, hashed)
+                if os.path.exists(target):
+                    continue  # Content-addressed: already built
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target + '.gz', 'wb') as f:
+                    f.write(gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli:
+                    with open(target + '.br', 'wb') as f:
+                        f.write(brotli.compress(data, quality=11))
+                # Written last so a partial build never looks complete
+                with open(target, 'wb') as f:
+                    f.write(data)
+
+    os.makedirs(dist_dir, exist_ok=True)
+    tmp_path = os.path.join(dist_dir, f"manifest.json.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(dist_dir, 'manifest.json'))
+    return manifest
+
+
+class AssetManifest:
+    """Maps logical asset paths to fingerprinted URLs and serves them.
+
+    Without a built manifest every URL falls back to the plain /static path,
+    so development works without running the build.
+    """
+
+    def __init__(self, static_dir='static'):
+        self.static_dir = static_dir
+        self.dist_dir = os.path.join(static_dir, 'dist')
+        try:
+            with open(os.path.join(self.dist_dir, 'manifest.json')) as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.manifest = {}
+        # Only fingerprinted files are safe to cache forever (not manifest.json itself)
+        self.hashed = set(self.manifest.values())
+
+    def url(self, path):
+        hashed = self.manifest.get(path)
+        return f"/static/dist/{hashed}" if hashed else f"/static/{path}"
+
+    def theme_urls(self):
+        """Theme name -> stylesheet URL, for switching themes client-side"""
+        themes_dir = os.path.join(self.static_dir, 'css', 'themes')
+        try:
+            names = sorted(os.listdir(themes_dir))
+        except FileNotFoundError:
+            return {}
+        return {
+            os.path.splitext(name)[0]: self.url(f"css/themes/{name}")
+            for name in names if name.endswith('.css')
+        }
+
+    def send(self, path):
+        """Serve a fingerprinted asset, precompressed when the client accepts it"""
+        full_path = safe_join(self.dist_dir, path)
+        if path not in self.hashed or full_path is None or not os.path.isfile(full_path):
+            abort(404)
+
+        variant, encoding = full_path, None
+        for name, ext in ENCODINGS:
+            if request.accept_encodings[name] and os.path.isfile(full_path + ext):
+                variant, encoding = full_path + ext, name
+                break
+
+        # The file name carries the content hash, so it makes a strong ETag
+        etag = f"{os.path.basename(path)}-{encoding or 'identity'}"
+        response = send_file(
+            variant,
+            mimetype=mimetypes.guess_type(path)[0] or 'application/octet-stream',
+            etag=etag,
+            max_age=ONE_YEAR,
+            conditional=True
+        )
+        response.headers['Cache-Control'] = f"public, max-age={ONE_YEAR}, immutable"
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers.pop('Content-Disposition', None)  # Would name the .gz/.br variant
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fingerprint and precompress static assets')
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('--static-dir', default='static')
+    parser.add_argument('--clean', action='store_true', help='Remove previous builds first')
+    args = parser.parse_args(argv)
+
+    manifest = build(args.static_dir, clean=args.clean)
+    print(f"Built {len(manifest)} assets ({'gzip + brotli' if brotli else 'gzip'})", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+import threading
+
+
+class LazyThread:
+    """Daemon thread started on first use rather than at import.
+
+    Services are created when app.py is imported, before gunicorn forks its
+    workers, and threads do not survive fork(). Starting on first use gives
+    every worker its own thread, and restarts it if it has died.
+    """
+
+    def __init__(self, target, name):
+        self.target = target
+        self.name = name
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def ensure_started(self, *args):
+        """Start the thread with args unless it is running; returns True if this call started it"""
+        with self._lock:
+            if self.is_alive():
+                return False
+            self._thread = threading.Thread(target=self.target, args=args, name=self.name, daemon=True)
+            self._thread.start()
+            return True
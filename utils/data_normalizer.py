@@ -1,5 +1,24 @@
 import re
 from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Salary amounts such as "$100,000", "$120,000.00", "60.000", "85.5", "90k" or "$1.2M",
+# alone or as a range
+SALARY_AMOUNT = r'([$£€]\s*)?(\d{1,3}(?:[,.]\d{3})+(?:[,.]\d{2})?(?!\d)|\d+(?:\.\d+)?)\s*(?:([kKmM])\b)?'
+SALARY_RANGE = re.compile(SALARY_AMOUNT + r'(?:\s*(?:-|–|to)\s*' + SALARY_AMOUNT + ')?')
+SALARY_GROUPED = re.compile(r'(\d{1,3}(?:[,.]\d{3})+)(?:[,.](\d{2}))?')
+SALARY_SUFFIXES = {'k': 1000, 'm': 1000000}
+SALARY_MAX_SPREAD = 5  # Ranges wider than max/min = 5 are parsing mistakes, not salaries
+SALARY_ANNUAL_MIN = 1000  # Anything lower was misread (e.g. "₹5,00,000" as 5)
+SALARY_ANNUAL_MAX = 5000000
+SALARY_PERIOD = re.compile(r'\b(hour|hr|day|daily|week|month|mo|year|yr|annum|annual)')
+PERIODS_PER_YEAR = {
+    'hour': 2080, 'hr': 2080, 'day': 260, 'daily': 260, 'week': 52,
+    'month': 12, 'mo': 12, 'year': 1, 'yr': 1, 'annum': 1, 'annual': 1
+}
+
+# Query parameters that identify a posting; tracking ones (refId, trackingId, ...) are dropped
+URL_ID_PARAMS = {'jk', 'vjk', 'currentjobid'}
 
 class JobNormalizer:
     @staticmethod
@@ -13,7 +32,7 @@ class JobNormalizer:
             'salary': job_data.get('salary', ''),
             'apply_url': job_data.get('apply_url', ''),
             'source': source,
-            'posted_date': job_data.get('posted_date', datetime.now().strftime('%Y-%m-%d')),
+            'posted_date': job_data.get('posted_date') or datetime.now().strftime('%Y-%m-%d'),
             'description': job_data.get('description', '')
         }
         
@@ -21,6 +40,9 @@ class JobNormalizer:
         normalized['title'] = normalized['title'].strip()
         normalized['company'] = normalized['company'].strip()
         normalized['location'] = normalized['location'].strip()
+        normalized['location_normalized'] = JobNormalizer.normalize_location(normalized['location'])
+        normalized['seniority'] = JobNormalizer.detect_seniority(normalized['title'])
+        normalized['salary_min'], normalized['salary_max'] = JobNormalizer.parse_salary(normalized['salary'])
         
         # Extract skills from description if available
         if normalized['description']:
@@ -64,3 +86,76 @@ class JobNormalizer:
             return 'Management'
         else:
             return 'Mid Level'
+    
+    @staticmethod
+    def normalize_location(location):
+        """Reduce a location to its city (or 'Remote') for grouping"""
+        city = location.split(',')[0].split('(')[0].strip()
+        if not city or 'remote' in city.lower():
+            return 'Remote'
+        return city.title()
+    
+    @staticmethod
+    def canonical_url(url):
+        """Strip per-fetch tracking parameters and fragments so a posting keeps one URL"""
+        if not url:
+            return ''
+        parts = urlsplit(url.strip())
+        query = urlencode(sorted(
+            (key, value) for key, value in parse_qsl(parts.query)
+            if key.lower() in URL_ID_PARAMS
+        ))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), query, ''))
+    
+    @staticmethod
+    def parse_salary(salary):
+        """Parse a salary string into an annual (min, max) range, or (None, None).
+
+        Amounts marked as money (currency symbol or k/M suffix) win over bare
+        numbers, so "2 years experience, $70k" parses as 70000.
+        """
+        if not salary:
+            return None, None
+        
+        chosen = None
+        for match in SALARY_RANGE.finditer(salary):
+            groups = match.groups()
+            amounts = []
+            for currency, number, suffix in (groups[:3], groups[3:]):
+                if number is None:
+                    continue
+                grouped = SALARY_GROUPED.fullmatch(number)
+                if grouped:
+                    whole, cents = grouped.groups()
+                    number = whole.replace(',', '').replace('.', '') + (f".{cents}" if cents else '')
+                amounts.append(float(number) * SALARY_SUFFIXES.get((suffix or '').lower(), 1))
+            amounts = [amount for amount in amounts if amount]
+            if not amounts:
+                continue
+            marked = any(groups[0::3]) or any(groups[2::3])
+            if marked or chosen is None:
+                chosen = match, amounts
+            if marked:
+                break
+        if chosen is None:
+            return None, None
+        match, amounts = chosen
+        
+        low, high = min(amounts), max(amounts)
+        if high > low * SALARY_MAX_SPREAD:
+            return None, None
+        
+        # A period after the amount ("$30 per hour") binds tighter than one elsewhere
+        text = salary.lower()
+        period = SALARY_PERIOD.search(text, match.end()) or SALARY_PERIOD.search(text)
+        if period and high * PERIODS_PER_YEAR[period.group(1)] <= SALARY_ANNUAL_MAX:
+            multiplier = PERIODS_PER_YEAR[period.group(1)]
+        elif period:
+            multiplier = 1  # "$70k, 40 hours a week": the period describes something else
+        else:
+            # Bare small amounts ("$25 - $30") are hourly rates
+            multiplier = 2080 if high < 1000 else 1
+        
+        if high * multiplier < SALARY_ANNUAL_MIN:
+            return None, None
+        return round(low * multiplier), round(high * multiplier)
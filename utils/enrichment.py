@@ -0,0 +1,178 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+import redis
+from utils.background import LazyThread
+from utils.data_normalizer import JobNormalizer
+
+logger = logging.getLogger(__name__)
+
+
+class JobEnricher:
+    """Adds descriptions and skills from job detail pages to scraped cards.
+
+    Only the jobs passed in are considered, so callers enrich lazily: the page
+    of results actually shown, or the top of a preliminary ranking. Parsed
+    details are cached in Redis by canonical job URL for `ttl` seconds, and
+    failed or timed-out fetches for `failure_ttl` seconds so a blocked source
+    is not retried on every search.
+
+    Outbound fetches are bounded twice: at most `budget` per source per call,
+    and at most `rate_limit` per source per `rate_window` seconds across all
+    requests and workers, counted in Redis. Fetches run on a background event
+    loop; a caller waits at most `wait` seconds for them, and anything slower
+    still completes (within `timeout`) and lands in the cache for later
+    searches.
+    """
+
+    def __init__(self, scraper, cache, budget=5, concurrency=4, timeout=8, wait=1.0,
+                 rate_limit=30, rate_window=60, ttl=7 * 24 * 3600, failure_ttl=600):
+        self.scraper = scraper
+        self.cache = cache
+        self.budget = budget
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.wait = wait
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._loop_thread = LazyThread(self._run_loop, 'detail-enricher')
+
+    @staticmethod
+    def cache_key(url):
+        url = JobNormalizer.canonical_url(url)
+        return 'jobdetail:' + hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    async def enrich(self, jobs):
+        """Attach 'description' and 'skills' to jobs in place; returns how many were enriched"""
+        jobs = [job for job in jobs if job.get('apply_url') and not job.get('description')]
+        if not jobs:
+            return 0
+
+        keys = [self.cache_key(job['apply_url']) for job in jobs]
+        try:
+            cached = self.cache.mget(keys)
+        except redis.RedisError as e:
+            logger.error(f"Enrichment cache read error: {e}")
+            cached = [None] * len(jobs)
+
+        enriched = 0
+        missing = {}
+        for job, key, value in zip(jobs, keys, cached):
+            if value:
+                detail = json.loads(value)
+                if detail:  # null marks a recent failed fetch
+                    self.apply(job, detail)
+                    enriched += 1
+                continue
+            source = job.get('source', '').lower()
+            per_source = missing.setdefault(source, [])
+            if len(per_source) < self.budget:
+                per_source.append((job, key))
+
+        to_fetch = []
+        for source, items in missing.items():
+            to_fetch.extend(items[:self.reserve(source, len(items))])
+        if not to_fetch:
+            return enriched
+
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch_and_cache([(job['apply_url'], job.get('source', ''), key) for job, key in to_fetch]),
+            self.background_loop()
+        )
+        # Wait on a local future: the request's loop may be gone when the fetches finish
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        future.add_done_callback(lambda _: self._wake(loop, waiter))
+        await asyncio.wait([waiter], timeout=self.wait)
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            return enriched
+
+        details = future.result()
+        for job, key in to_fetch:
+            if details.get(key):
+                self.apply(job, details[key])
+                enriched += 1
+        return enriched
+
+    def reserve(self, source, wanted):
+        """Take up to `wanted` fetches from the source's shared budget for the current window"""
+        key = f"jobdetail:budget:{source}:{int(time.time() // self.rate_window)}"
+        try:
+            pipe = self.cache.pipeline(transaction=False)
+            pipe.incrby(key, wanted)
+            pipe.expire(key, self.rate_window)
+            used = pipe.execute()[0]
+        except redis.RedisError as e:
+            # Without the shared counter the budget cannot be enforced, so don't fetch
+            logger.error(f"Enrichment budget error: {e}")
+            return 0
+        return max(0, min(wanted, self.rate_limit - (used - wanted)))
+
+    async def fetch_and_cache(self, items):
+        """Fetch (url, source, key) detail pages and cache the outcome; returns {key: detail}"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.ensure_future(self.fetch_detail(semaphore, url, source)) for url, source, _ in items]
+        done, pending = await asyncio.wait(tasks, timeout=self.timeout)
+        for task in pending:
+            task.cancel()
+
+        details = {}
+        for task, (_, _, key) in zip(tasks, items):
+            if task in done and not task.cancelled() and task.exception() is None:
+                details[key] = task.result()
+            else:
+                details[key] = None
+
+        try:
+            pipe = self.cache.pipeline(transaction=False)
+            for key, detail in details.items():
+                if detail:
+                    pipe.setex(key, self.ttl, json.dumps(detail))
+                else:
+                    pipe.setex(key, self.failure_ttl, 'null')
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Enrichment cache write error: {e}")
+        return details
+
+    async def fetch_detail(self, semaphore, url, source):
+        source = source.lower()
+        async with semaphore:
+            # Detail pages are not archived: replay only understands result pages
+            html = await self.scraper.fetch_page(f"{source}_detail", url, archive=False)
+        if not html:
+            return None
+        description, skills = await self.scraper.parse_pool.parse_detail(source, html)
+        return {'description': description, 'skills': skills}
+
+    def background_loop(self):
+        """The event loop detail fetches run on, started in this worker on first use"""
+        with self._loop_lock:
+            if not self._loop_thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread.ensure_started(self._loop)
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    @staticmethod
+    def _wake(loop, waiter):
+        try:
+            loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
+        except RuntimeError:
+            pass  # The request finished and its loop has closed
+
+    @staticmethod
+    def apply(job, detail):
+        job['description'] = detail['description']
+        job['skills'] = detail['skills']
@@ -0,0 +1,198 @@
+import bisect
+from collections import defaultdict
+
+
+def bitmap_from_ids(ids):
+    """Build an int bitmap with the given document ids set"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for doc_id in ids:
+        buf[doc_id >> 3] |= 1 << (doc_id & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def clean_filters(filters, fields):
+    """Validate {field: [value, ...]} facet filters, raising ValueError on bad input"""
+    if filters is None:
+        return {}
+    if not isinstance(filters, dict):
+        raise ValueError('filters must be an object')
+    cleaned = {}
+    for field, values in filters.items():
+        if field not in fields:
+            raise ValueError(f"Unknown filter field: {field}")
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"Filter values for {field} must be a list of strings")
+        if values:
+            cleaned[field] = values
+    return cleaned
+
+
+def clean_amount(value, name):
+    """Validate an optional numeric salary bound, raising ValueError on bad input"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"{name} must be a non-negative number")
+    return value
+
+
+def iter_ids(bitmap, reverse=True):
+    """Yield document ids set in a bitmap, highest (newest) first by default"""
+    if reverse:
+        while bitmap:
+            doc_id = bitmap.bit_length() - 1
+            yield doc_id
+            bitmap ^= 1 << doc_id
+    else:
+        while bitmap:
+            low = bitmap & -bitmap
+            yield low.bit_length() - 1
+            bitmap ^= low
+
+
+class SalaryIndex:
+    """Numeric index over one salary bound (annual amounts).
+
+    Documents are grouped into fixed-width buckets, each with a bitmap and a
+    sorted (value, id) list. A threshold query ORs the bitmaps of whole
+    buckets past the threshold and only inspects members of the single
+    boundary bucket.
+    """
+
+    def __init__(self, bucket_size=5000):
+        self.bucket_size = bucket_size
+        self.bitmaps = defaultdict(int)
+        self.members = defaultdict(list)
+
+    def add_many(self, values):
+        """Index (doc_id, value) pairs"""
+        grouped = defaultdict(list)
+        for doc_id, value in values:
+            bucket = int(value // self.bucket_size)
+            grouped[bucket].append(doc_id)
+            bisect.insort(self.members[bucket], (value, doc_id))
+        for bucket, ids in grouped.items():
+            self.bitmaps[bucket] |= bitmap_from_ids(ids)
+
+    def at_least(self, threshold):
+        boundary = int(threshold // self.bucket_size)
+        result = 0
+        for bucket, bitmap in self.bitmaps.items():
+            if bucket > boundary:
+                result |= bitmap
+        members = self.members.get(boundary, [])
+        start = bisect.bisect_left(members, (threshold, -1))
+        return result | bitmap_from_ids(doc_id for _, doc_id in members[start:])
+
+    def at_most(self, threshold):
+        boundary = int(threshold // self.bucket_size)
+        result = 0
+        for bucket, bitmap in self.bitmaps.items():
+            if bucket < boundary:
+                result |= bitmap
+        members = self.members.get(boundary, [])
+        end = bisect.bisect_right(members, (threshold, float('inf')))
+        return result | bitmap_from_ids(doc_id for _, doc_id in members[:end])
+
+
+class FacetIndex:
+    """Bitmap indexes over the job corpus for faceted filtering.
+
+    Each facet value maps to an int bitmap of document ids, so combining
+    filters is a handful of big-int AND/OR operations and a facet count is a
+    popcount. Values are matched case-insensitively. Facet counts are
+    disjunctive: the counts for a facet ignore that facet's own filter, so
+    selecting "Remote" still shows how many Hybrid jobs are available.
+    Popcounts dominate query time, so only the `facet_limit` most common
+    values of each facet (by corpus-wide count) are counted per query.
+    """
+
+    FIELDS = {
+        'work_mode': 'work_mode',
+        'seniority': 'seniority',
+        'source': 'source',
+        'location': 'location_normalized'
+    }
+
+    def __init__(self, salary_bucket=5000):
+        self.bitmaps = {field: defaultdict(int) for field in self.FIELDS}
+        self.labels = {field: {} for field in self.FIELDS}
+        self.totals = {field: defaultdict(int) for field in self.FIELDS}
+        self.salary_min = SalaryIndex(salary_bucket)
+        self.salary_max = SalaryIndex(salary_bucket)
+        self.size = 0
+
+    def add_many(self, start_id, jobs):
+        """Index a batch of normalized jobs with consecutive ids from start_id"""
+        grouped = {field: defaultdict(list) for field in self.FIELDS}
+        salary_min, salary_max = [], []
+        for doc_id, job in enumerate(jobs, start_id):
+            for field, key in self.FIELDS.items():
+                label = job.get(key) or 'Not specified'
+                value = label.lower()
+                self.labels[field].setdefault(value, label)
+                grouped[field][value].append(doc_id)
+            if job.get('salary_max') is not None:
+                salary_min.append((doc_id, job['salary_min']))
+                salary_max.append((doc_id, job['salary_max']))
+
+        for field, values in grouped.items():
+            for value, ids in values.items():
+                self.bitmaps[field][value] |= bitmap_from_ids(ids)
+                self.totals[field][value] += len(ids)
+        self.salary_min.add_many(salary_min)
+        self.salary_max.add_many(salary_max)
+        self.size = max(self.size, start_id + len(jobs))
+
+    def field_mask(self, field, values):
+        mask = 0
+        for value in values:
+            mask |= self.bitmaps[field].get(value.lower(), 0)
+        return mask
+
+    def search(self, filters=None, salary_min=None, salary_max=None, facet_limit=20):
+        """Return (matching bitmap, facet counts) for the given filters.
+
+        `filters` maps facet names to lists of accepted values. salary_min
+        keeps jobs whose range reaches that amount; salary_max keeps jobs
+        whose range starts at or below it.
+        """
+        masks = {}
+        for field, values in (filters or {}).items():
+            if field in self.FIELDS and values:
+                masks[field] = self.field_mask(field, values)
+
+        # None stands for "every document" to skip needless full-width ANDs
+        salary_mask = None
+        if salary_min is not None:
+            salary_mask = self.salary_max.at_least(salary_min)
+        if salary_max is not None:
+            upper = self.salary_min.at_most(salary_max)
+            salary_mask = upper if salary_mask is None else salary_mask & upper
+
+        facets = {}
+        for field in self.FIELDS:
+            base = salary_mask
+            for other, mask in masks.items():
+                if other != field:
+                    base = mask if base is None else base & mask
+            totals = self.totals[field]
+            candidates = sorted(totals, key=totals.get, reverse=True)[:facet_limit]
+            if base is None:
+                counts = [(totals[value], value) for value in candidates]
+            else:
+                counts = [((base & self.bitmaps[field][value]).bit_count(), value) for value in candidates]
+            facets[field] = {
+                self.labels[field][value]: count
+                for count, value in sorted(counts, reverse=True) if count
+            }
+
+        result = salary_mask
+        for mask in masks.values():
+            result = mask if result is None else result & mask
+        if result is None:
+            result = (1 << self.size) - 1
+        return result, facets
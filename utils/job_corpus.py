@@ -0,0 +1,134 @@
+import os
+import json
+import logging
+import threading
+from utils.append_log import AppendLog
+from utils.data_normalizer import JobNormalizer
+
+logger = logging.getLogger(__name__)
+
+
+class JobCorpus:
+    """Append-only, JSON-lines persisted corpus of normalized jobs.
+
+    Every web worker keeps an in-memory copy and catches up by reading the
+    records appended to the shared AppendLog since its last refresh(), so jobs ingested by one gunicorn
+    worker become visible to the others without a shared server. Jobs are
+    deduplicated by canonical apply URL (or title, company and location).
+
+    Two kinds of hooks are supported:
+      * listeners(start_id, jobs) run in every worker for every batch loaded,
+        and are used to maintain in-memory indexes;
+      * ingest hooks(jobs) run once, in the worker that ingested the jobs,
+        and are meant for side effects such as notifications.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.log = AppendLog(path)
+        self.jobs = []
+        self.keys = set()
+        self.listeners = []
+        self.ingest_hooks = []
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def job_key(job):
+        # Canonical so per-fetch tracking parameters don't make a posting look new
+        url = JobNormalizer.canonical_url(job.get('apply_url', ''))
+        return url or f"{job['title']}_{job['company']}_{job['location']}".lower()
+
+    def add_listener(self, listener):
+        """Register an index listener and replay the jobs loaded so far into it"""
+        with self._lock:
+            self.listeners.append(listener)
+            if self.jobs:
+                listener(0, self.jobs)
+
+    def add_ingest_hook(self, hook):
+        self.ingest_hooks.append(hook)
+
+    def refresh(self):
+        """Load jobs appended to the corpus file since the last refresh"""
+        with self._lock:
+            start_id = len(self.jobs)
+            for job in self.log.read_new():
+                key = self.job_key(job)
+                if key not in self.keys:
+                    self.keys.add(key)
+                    self.jobs.append(job)
+
+            added = self.jobs[start_id:]
+            if added:
+                for listener in self.listeners:
+                    # The batch is already loaded; one failing index must not starve the others
+                    try:
+                        listener(start_id, added)
+                    except Exception as e:
+                        logger.error(f"Corpus listener error: {e}")
+            return len(added)
+
+    def ingest(self, jobs):
+        """Normalize, persist and index jobs not yet in the corpus; returns the new jobs"""
+        with self._lock:
+            self.refresh()
+            new_jobs = []
+            batch_keys = set()
+            for job in jobs:
+                normalized = JobNormalizer.normalize(job, job.get('source', ''))
+                key = self.job_key(normalized)
+                if key not in self.keys and key not in batch_keys:
+                    batch_keys.add(key)
+                    new_jobs.append(normalized)
+            if not new_jobs:
+                return []
+
+            self.log.append(new_jobs)
+            self.refresh()
+
+        for hook in self.ingest_hooks:
+            try:
+                hook(new_jobs)
+            except Exception as e:
+                logger.error(f"Ingest hook error: {e}")
+        return new_jobs
+
+    def get(self, doc_id):
+        return self.jobs[doc_id]
+
+
+def backfill(path, jobs):
+    """Merge re-parsed jobs into a corpus file, replacing records with the same key.
+
+    Existing jobs keep their position; unseen jobs are appended. The file is
+    rewritten atomically, so run this with the web workers stopped: they hold
+    byte offsets into the old file and must reload it from scratch. Returns
+    (replaced, added).
+    """
+    records, positions = [], {}
+    for job in AppendLog(path).read_new():
+        key = JobCorpus.job_key(job)
+        if key not in positions:
+            positions[key] = len(records)
+            records.append(job)
+
+    replaced = added = 0
+    for job in jobs:
+        key = JobCorpus.job_key(job)
+        if key in positions:
+            records[positions[key]] = job
+            replaced += 1
+        else:
+            positions[key] = len(records)
+            records.append(job)
+            added += 1
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        for job in records:
+            f.write(json.dumps(job) + '\n')
+    os.replace(tmp_path, path)
+    return replaced, added
@@ -0,0 +1,75 @@
+import os
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, REGISTRY,
+    CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+
+# Latency buckets (seconds) tuned for outbound fetches and in-process work
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+WORK_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+SCRAPE_FETCH_SECONDS = Histogram(
+    'careerintel_scrape_fetch_seconds',
+    'Time spent fetching a result page from a job source',
+    ['source'], buckets=FETCH_BUCKETS
+)
+SCRAPE_PARSE_SECONDS = Histogram(
+    'careerintel_scrape_parse_seconds',
+    'Time spent parsing a fetched result page',
+    ['source'], buckets=WORK_BUCKETS
+)
+PARSE_WAIT_SECONDS = Histogram(
+    'careerintel_parse_wait_seconds',
+    'Time a fetched page waited for a free parser pool slot',
+    ['source'], buckets=WORK_BUCKETS
+)
+SCRAPE_JOBS = Histogram(
+    'careerintel_scrape_jobs',
+    'Jobs extracted per source fetch',
+    ['source'], buckets=(0, 1, 5, 10, 20, 50, 100)
+)
+SCRAPE_ERRORS = Counter(
+    'careerintel_scrape_errors_total',
+    'Failed or non-200 source fetches',
+    ['source']
+)
+DEDUP_RATIO = Histogram(
+    'careerintel_dedup_ratio',
+    'Fraction of scraped jobs dropped as duplicates per search',
+    buckets=(0, 0.05, 0.1, 0.25, 0.5, 0.75, 1)
+)
+MATCH_SECONDS = Histogram(
+    'careerintel_match_seconds',
+    'Time spent scoring jobs against CV skills',
+    buckets=WORK_BUCKETS
+)
+CACHE_REQUESTS = Counter(
+    'careerintel_cache_requests_total',
+    'Job search cache lookups by result (hit, miss, stale, error)',
+    ['result']
+)
+CV_STAGE_SECONDS = Histogram(
+    'careerintel_cv_stage_seconds',
+    'Time spent in each CV analysis stage',
+    ['stage'], buckets=WORK_BUCKETS
+)
+PROBE_SECONDS = Histogram(
+    'careerintel_probe_seconds',
+    'Health probe latency per dependency',
+    ['target'], buckets=FETCH_BUCKETS
+)
+
+
+def render_metrics():
+    """Render all metrics in Prometheus text format.
+
+    Under gunicorn each worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+    (see gunicorn.conf.py); in that case the samples of every worker are
+    aggregated here instead of reporting only the worker serving the scrape.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,154 @@
+import os
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+
+
+SEARCH_PARAMS = ('keywords', 'q')  # LinkedIn and Indeed search terms
+
+
+def search_query(url):
+    """The search terms in an archived result page URL"""
+    params = parse_qs(urlsplit(url).query)
+    for name in SEARCH_PARAMS:
+        if params.get(name):
+            return params[name][0]
+    return ''
+
+
+class PageArchive:
+    """Content-addressed store of fetched result pages.
+
+    Pages are gzip-compressed under objects/<sha[:2]>/<sha>.html.gz, so a page
+    fetched twice is stored once. Every fetch appends a metadata line (source,
+    url, status, fetch time, size) to index/<date>.jsonl, which replay() walks
+    to re-run parsing and normalization without touching the network.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest + '.html.gz')
+
+    def store(self, source, url, html, status=200, elapsed_ms=None, fetched_at=None):
+        """Archive a fetched page and its fetch metadata, returning the content hash"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        fetched_at = fetched_at or datetime.now()
+        entry = {
+            'sha256': digest,
+            'source': source,
+            'url': url,
+            'status': status,
+            'fetched_at': fetched_at.isoformat(),
+            'size': len(data),
+            'elapsed_ms': elapsed_ms
+        }
+        index_dir = os.path.join(self.root, 'index')
+        os.makedirs(index_dir, exist_ok=True)
+        # Single short appends keep lines intact across gunicorn workers
+        with open(os.path.join(index_dir, fetched_at.strftime('%Y-%m-%d') + '.jsonl'), 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        return digest
+
+    def load(self, digest):
+        """Return the HTML of an archived page"""
+        with gzip.open(self.object_path(digest), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def entries(self, source=None, since=None, unique=True):
+        """Iterate index entries, oldest first, optionally filtered by source and date"""
+        index_dir = os.path.join(self.root, 'index')
+        if not os.path.isdir(index_dir):
+            return
+        seen = set()
+        for name in sorted(os.listdir(index_dir)):
+            if not name.endswith('.jsonl') or (since and name[:10] < since):
+                continue
+            with open(os.path.join(index_dir, name)) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn line from a crashed writer
+                    if source and entry['source'] != source:
+                        continue
+                    if unique:
+                        if entry['sha256'] in seen:
+                            continue
+                        seen.add(entry['sha256'])
+                    yield entry
+
+    def replay(self, source=None, since=None, workers=None):
+        """Re-parse and normalize archived pages in parallel, yielding (entry, jobs)"""
+        tasks = ((self.root, entry) for entry in self.entries(source, since))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(_replay_entry, tasks, chunksize=8)
+
+
+def _replay_entry(task):
+    from utils.data_normalizer import JobNormalizer
+    from utils.scrapers.parse_pool import parse_page, apply_search_defaults
+    root, entry = task
+    html = PageArchive(root).load(entry['sha256'])
+    jobs, _ = parse_page(entry['source'], html)
+    # Same card defaults as the live scrape path
+    apply_search_defaults(jobs, search_query(entry['url']))
+    for job in jobs:
+        # Parsers stamp today's date; the page was seen when it was fetched
+        job['posted_date'] = entry['fetched_at'][:10]
+    return entry, [JobNormalizer.normalize(job, job.get('source', entry['source'])) for job in jobs]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay archived result pages through the parsers')
+    parser.add_argument('archive', help='Archive root directory (PAGE_ARCHIVE_DIR)')
+    parser.add_argument('--source', help='Only replay pages from this source')
+    parser.add_argument('--since', help='Only replay pages fetched on or after YYYY-MM-DD')
+    parser.add_argument('--workers', type=int, help='Parser processes (default: one per core)')
+    parser.add_argument('--output', help='Write normalized jobs as JSON lines to a new file (default: stdout)')
+    parser.add_argument('--backfill', metavar='CORPUS_PATH',
+                        help='Merge jobs into this corpus file, replacing stale records (stop the app first)')
+    args = parser.parse_args(argv)
+
+    archive = PageArchive(args.archive)
+    if args.backfill:
+        from utils.job_corpus import backfill
+        replayed = archive.replay(args.source, args.since, args.workers)
+        replaced, added = backfill(args.backfill, (job for _, jobs in replayed for job in jobs))
+        print(f"Backfilled {args.backfill}: {replaced} jobs replaced, {added} added", file=sys.stderr)
+        return
+
+    # 'x' so a mistyped path can never truncate the corpus; use --backfill for that
+    out = open(args.output, 'x') if args.output else sys.stdout
+    pages = jobs_count = 0
+    try:
+        for entry, jobs in archive.replay(args.source, args.since, args.workers):
+            pages += 1
+            for job in jobs:
+                job['archive_sha256'] = entry['sha256']
+                job['fetched_at'] = entry['fetched_at']
+                out.write(json.dumps(job) + '\n')
+            jobs_count += len(jobs)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Replayed {pages} pages, {jobs_count} jobs", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+import os
+import re
+import sys
+import time
+import uuid
+import cProfile
+import asyncio
+import functools
+import logging
+import threading
+from collections import Counter
+from flask import request
+from utils.background import LazyThread
+
+logger = logging.getLogger(__name__)
+
+# <created ms>-<endpoint>-<duration>ms-<random>.<ext>, as written by RequestProfiler.save
+PROFILE_NAME = re.compile(r'(\d+)-(\w+)-(\d+)ms-[0-9a-f]+\.(folded|prof)')
+
+
+class StackSampler:
+    """Background thread sampling the stacks of registered threads.
+
+    One sampler is shared by every in-flight request of a worker process, so
+    the cost of always-on slow-request capture is a single thread waking up
+    every `interval` seconds, and nothing at all while the worker is idle.
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self._targets = {}  # session -> thread ident
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = LazyThread(self._run, 'stack-sampler')
+
+    def register(self, session, ident):
+        with self._lock:
+            self._targets[session] = ident
+        self._thread.ensure_started()
+        self._wakeup.set()
+
+    def unregister(self, session):
+        with self._lock:
+            self._targets.pop(session, None)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            frames = sys._current_frames()
+            # Sampling under the lock guarantees no writes after unregister()
+            with self._lock:
+                if not self._targets:
+                    self._wakeup.clear()
+                    continue
+                for session, ident in self._targets.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        session.samples[fold_stack(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+def fold_stack(frame):
+    """Render a frame's stack root-first in the folded format used by flamegraph tools"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class ProfileSession:
+    def __init__(self, endpoint, mode, forced):
+        self.endpoint = endpoint
+        self.mode = mode
+        self.forced = forced
+        self.samples = Counter()
+        self.profile = cProfile.Profile() if mode == 'cprofile' else None
+        self.started = time.perf_counter()
+
+
+class RequestProfiler:
+    """Opt-in per-request profiling with automatic slow-request capture.
+
+    A request is profiled on demand when it carries `X-Profile: sample` (or
+    `cprofile`) and `is_admin()` accepts it, and captured automatically
+    when it takes longer than `slow_threshold` seconds. Sampled profiles are
+    written as folded stacks (`.folded`, readable by flamegraph.pl, speedscope
+    and inferno); cProfile runs are written as pstats dumps (`.prof`). Only the
+    newest `max_profiles` files are kept in `profile_dir`.
+    """
+
+    EXTENSIONS = {'sample': '.folded', 'cprofile': '.prof'}
+
+    def __init__(self, profile_dir, max_profiles=50, slow_threshold=2.0,
+                 interval=0.01, is_admin=lambda: False):
+        self.profile_dir = profile_dir
+        self.max_profiles = max_profiles
+        self.slow_threshold = slow_threshold
+        self.is_admin = is_admin  # Called in request context: may this request force a profile?
+        self.sampler = StackSampler(interval)
+
+    def profiled(self, endpoint):
+        """Decorator profiling a (sync or async) view when requested or slow"""
+        def decorator(view):
+            if asyncio.iscoroutinefunction(view):
+                @functools.wraps(view)
+                async def wrapper(*args, **kwargs):
+                    session = self.start(endpoint)
+                    try:
+                        return await view(*args, **kwargs)
+                    finally:
+                        self.finish(session)
+            else:
+                @functools.wraps(view)
+                def wrapper(*args, **kwargs):
+                    session = self.start(endpoint)
+                    try:
+                        return view(*args, **kwargs)
+                    finally:
+                        self.finish(session)
+            return wrapper
+        return decorator
+
+    def start(self, endpoint):
+        mode = request.headers.get('X-Profile', '').lower()
+        forced = mode in self.EXTENSIONS and self.is_admin()
+        if not forced:
+            if not self.slow_threshold:
+                return None
+            mode = 'sample'
+
+        session = ProfileSession(endpoint, mode, forced)
+        if session.profile:
+            session.profile.enable()
+        else:
+            # Runs on the thread executing the view (the event loop thread for async views)
+            self.sampler.register(session, threading.get_ident())
+        return session
+
+    def finish(self, session):
+        if session is None:
+            return
+        duration = time.perf_counter() - session.started
+        if session.profile:
+            session.profile.disable()
+        else:
+            self.sampler.unregister(session)
+
+        # A request shorter than one sampling interval has nothing to write
+        if session.mode == 'sample' and not session.samples:
+            return
+        if session.forced or duration >= self.slow_threshold:
+            try:
+                self.save(session, duration)
+            except OSError as e:
+                logger.error(f"Profile write error: {e}")
+
+    def save(self, session, duration):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        profile_id = (f"{int(time.time() * 1000)}-{session.endpoint}-"
+                      f"{int(duration * 1000)}ms-{uuid.uuid4().hex[:8]}")
+        path = os.path.join(self.profile_dir, profile_id + self.EXTENSIONS[session.mode])
+
+        if session.profile:
+            session.profile.dump_stats(path)
+        else:
+            with open(path, 'w') as f:
+                for stack, count in session.samples.items():
+                    f.write(f"{stack} {count}\n")
+
+        self.trim()
+        return path
+
+    def trim(self):
+        """Drop the oldest profiles beyond max_profiles (file names sort by time)"""
+        for name in self.list_files()[:-self.max_profiles or None]:
+            try:
+                os.remove(os.path.join(self.profile_dir, name))
+            except FileNotFoundError:
+                pass  # Already trimmed by another worker
+
+    def list_files(self):
+        try:
+            names = os.listdir(self.profile_dir)
+        except FileNotFoundError:
+            return []
+        # Other files in the directory are neither listed nor trimmed
+        return sorted(n for n in names if PROFILE_NAME.fullmatch(n))
+
+    def list_profiles(self):
+        """Describe stored profiles, newest first"""
+        profiles = []
+        for name in reversed(self.list_files()):
+            created, endpoint, duration, ext = PROFILE_NAME.fullmatch(name).groups()
+            try:
+                size = os.path.getsize(os.path.join(self.profile_dir, name))
+            except FileNotFoundError:
+                continue
+            profiles.append({
+                'id': name,
+                'endpoint': endpoint,
+                'duration_ms': int(duration),
+                'created': int(created) / 1000,
+                'format': 'folded' if ext == 'folded' else 'pstats',
+                'size': size
+            })
+        return profiles
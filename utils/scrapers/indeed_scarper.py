@@ -25,13 +25,13 @@ class IndeedScraper:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, headers=self.headers) as response:
                     if response.status == 200:
-                        return await self.parse_html(await response.text(), limit)
+                        return self.parse_html(await response.text(), limit)
         except Exception as e:
             print(f"Indeed scraping error: {e}")
         
         return []
     
-    async def parse_html(self, html, limit):
+    def parse_html(self, html, limit):
         """Parse Indeed job listings from HTML"""
         soup = BeautifulSoup(html, 'html.parser')
         jobs = []
@@ -80,6 +80,14 @@ class IndeedScraper:
         
         return jobs
     
+    def parse_detail_html(self, html, max_chars=5000):
+        """Extract the job description text from an Indeed job detail page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        desc_elem = soup.find('div', {'id': 'jobDescriptionText'})
+        if not desc_elem:
+            return ''
+        return desc_elem.get_text(' ', strip=True)[:max_chars]
+    
     def detect_work_mode(self, location):
         """Detect work mode from location"""
         location_lower = location.lower()
@@ -26,13 +26,13 @@ class LinkedInScraper:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, headers=self.headers) as response:
                     if response.status == 200:
-                        return await self.parse_html(await response.text(), limit)
+                        return self.parse_html(await response.text(), limit)
         except Exception as e:
             print(f"LinkedIn scraping error: {e}")
         
         return []
     
-    async def parse_html(self, html, limit):
+    def parse_html(self, html, limit):
         """Parse LinkedIn job listings from HTML"""
         soup = BeautifulSoup(html, 'html.parser')
         jobs = []
@@ -76,6 +76,16 @@ class LinkedInScraper:
         
         return jobs
     
+    def parse_detail_html(self, html, max_chars=5000):
+        """Extract the job description text from a LinkedIn job detail page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        # Public job pages render the description in one of these containers
+        desc_elem = (soup.find('div', {'class': 'show-more-less-html__markup'}) or
+                     soup.find('div', {'class': 'description__text'}))
+        if not desc_elem:
+            return ''
+        return desc_elem.get_text(' ', strip=True)[:max_chars]
+    
     def detect_work_mode(self, location):
         """Detect if job is remote, hybrid, or on-site"""
         location_lower = location.lower()
@@ -0,0 +1,157 @@
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_parsers = {}
+
+def get_parser(source):
+    """Per-process parser instances, keyed by lowercase source name"""
+    if not _parsers:
+        from utils.scrapers.linkedin_scraper import LinkedInScraper
+        from utils.scrapers.indeed_scarper import IndeedScraper
+        _parsers.update({'linkedin': LinkedInScraper(), 'indeed': IndeedScraper()})
+    return _parsers.get(source)
+
+
+def parse_page(source, html, limit=None):
+    """Parse one result page into plain job dicts, returning (jobs, seconds spent)"""
+    start = time.perf_counter()
+    parser = get_parser(source)
+    jobs = parser.parse_html(html, limit) if parser else []
+    return jobs, time.perf_counter() - start
+
+
+def apply_search_defaults(jobs, query):
+    """Fill in card fields the parsers may leave out, using the search that found the jobs"""
+    for job in jobs:
+        job.setdefault('location', 'Remote')
+        job.setdefault('apply_url', '')
+        if 'remote' in query.lower():
+            job['work_mode'] = 'Remote'
+    return jobs
+
+
+def parse_detail(source, html):
+    """Parse a job detail page, returning (description, skills, seconds spent)"""
+    from utils.data_normalizer import JobNormalizer
+    start = time.perf_counter()
+    parser = get_parser(source)
+    description = parser.parse_detail_html(html) if parser else ''
+    skills = JobNormalizer.extract_skills(description) if description else []
+    return description, skills, time.perf_counter() - start
+
+
+class LoopSlots:
+    """Counting semaphore shared by coroutines on different event loops.
+
+    Async Flask views each run on their own event loop, so asyncio.Semaphore
+    cannot bound them all. Waiters queue in FIFO order and a released slot is
+    handed straight to the next one through its own loop, with no polling.
+    """
+
+    def __init__(self, value):
+        self._free = value
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            waiter = (asyncio.get_running_loop(), asyncio.get_running_loop().create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            if not queued and waiter[1].done() and not waiter[1].cancelled():
+                self.release()  # Granted just as we were cancelled; pass the slot on
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._grant, future)
+                    return
+                except RuntimeError:
+                    continue  # Its loop has closed
+            self._free += 1
+
+    def _grant(self, future):
+        if future.done():
+            self.release()  # Cancelled before the hand-off arrived
+        else:
+            future.set_result(None)
+
+
+class ParsePool:
+    """Bounded process pool for CPU-bound result page parsing.
+
+    HTML goes in as a string and plain job dicts come back, so nothing but
+    builtins crosses the process boundary. At most `max_pending` pages are
+    queued or in flight; further callers wait (without blocking their event
+    loop) until a slot frees up, which keeps memory bounded when fetches
+    outpace parsing. The executor is created lazily so that each gunicorn
+    worker owns its own pool rather than inheriting one across fork().
+    """
+
+    def __init__(self, workers=2, max_pending=None):
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self._slots = LoopSlots(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                self._pid = os.getpid()
+            return self._executor
+
+    async def submit(self, fn, *args):
+        """Run fn(*args) in the pool, returning (result, queue wait seconds)"""
+        start = time.perf_counter()
+        await self._slots.acquire()
+        waited = time.perf_counter() - start
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, fn, *args)
+        except BrokenProcessPool:
+            # A crashed parser poisons the executor; start a fresh one next time
+            self.shutdown()
+            raise
+        finally:
+            self._slots.release()
+        return result, waited
+
+    async def parse(self, source, html, limit=None):
+        """Parse a result page in the pool, returning (jobs, parse seconds, queue wait seconds)"""
+        (jobs, elapsed), waited = await self.submit(parse_page, source, html, limit)
+        return jobs, elapsed, waited
+
+    async def parse_detail(self, source, html):
+        """Parse a job detail page in the pool, returning (description, skills)"""
+        (description, skills, _), _ = await self.submit(parse_detail, source, html)
+        return description, skills
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None